@@ -0,0 +1,14 @@
+"""
+WorldPop STAC Data Downloader - Headless Command-Line Entry Point
+
+Runs searches and downloads without a display; never imports tkinter or PIL.
+"""
+import multiprocessing
+import sys
+
+from src.cli.commands import main
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
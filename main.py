@@ -1,6 +1,7 @@
 """
 WorldPop Desktop Application - Main Entry Point
 """
+import multiprocessing
 import tkinter as tk
 
 from src.core.app import WorldPopApp
@@ -14,4 +15,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Needed by the COG conversion process pool in frozen executables
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,3 @@
+"""
+Headless Command-Line Interface Package
+"""
\ No newline at end of file
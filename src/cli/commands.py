@@ -0,0 +1,584 @@
+"""
+Headless CLI Commands - search and parallel download without a display
+
+Progress is written to stdout as one JSON object per line (or plain text with
+--progress text). Anything the API client logs goes to stderr so stdout stays
+machine-readable.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Any, Optional
+
+from src.config.config import (
+    API_BASE_URL, API_KEY, AVAILABLE_RESOLUTIONS, AVAILABLE_PROJECTS,
+    DEFAULT_DOWNLOAD_DIR, DOWNLOAD_WORKERS, SHARED_CACHE_DIR, SHARED_CACHE_MODE,
+    QUERY_CACHE_DIR, QUERY_CACHE_TTL, MIRROR_PATH, CATALOG_SNAPSHOT_PATH
+)
+from src.core.api_client import WorldPopSTACClient
+from src.core.cache import SharedDownloadCache, CACHE_MODES
+from src.core.catalog_snapshot import CatalogSnapshot, SyncTracker
+from src.core.cog import CogPipeline, benchmark_windowed_reads
+from src.core.downloader import plan_downloads, download_tasks
+from src.core.manifest import (
+    WorkManifest, create_manifest, DEFAULT_STALE_AFTER, DEFAULT_MAX_ATTEMPTS
+)
+from src.core.export import DEFAULT_EXPORT_COLUMNS, EXPORT_COLUMNS, write_export
+from src.core.items import item_key
+from src.core.mirror import CatalogMirror
+from src.core.query_cache import QueryCache
+from src.core.result_store import ResultStore
+from src.core.search import iter_search_pages, SEARCH_LIMIT
+from src.core.spatial import BBox, BBoxIndex, parse_bbox
+
+# Exit codes
+EXIT_OK = 0
+EXIT_DOWNLOAD_FAILED = 1  # At least one file failed or had no downloadable asset
+EXIT_USAGE = 2  # Same code argparse uses for bad arguments
+EXIT_SEARCH_FAILED = 3
+EXIT_NO_RESULTS = 4
+EXIT_ERROR = 5  # Filesystem, network or other runtime failure
+
+
+class ProgressReporter:
+    """Thread-safe progress writer for JSON lines or plain text"""
+
+    def __init__(self, mode: str = "json", stream=None):
+        self.mode = mode
+        self.stream = stream or sys.stdout
+        self.lock = threading.Lock()
+
+    def emit(self, event: str, **fields):
+        """Write a single progress event"""
+        record = {"event": event, "time": round(time.time(), 3)}
+        record.update(fields)
+        with self.lock:
+            if self.mode == "json":
+                self.stream.write(json.dumps(record, default=str) + "\n")
+            else:
+                if event == "file_progress":
+                    return
+                details = " ".join(f"{key}={value}" for key, value in fields.items())
+                self.stream.write(f"{event}: {details}\n")
+            self.stream.flush()
+
+
+def parse_years(values: Optional[List[str]]) -> List[int]:
+    """Parse year arguments such as '2020', '2015-2020' or '2018,2019'"""
+    years = set()
+    for value in values or []:
+        for part in value.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if '-' in part:
+                start, end = part.split('-', 1)
+                years.update(range(int(start), int(end) + 1))
+            else:
+                years.add(int(part))
+    return sorted(years)
+
+
+def resolve_collections(client, requested: List[str], bbox: Optional[BBox] = None,
+                        snapshot: Optional[CatalogSnapshot] = None) -> List[str]:
+    """Expand the special values 'all' and 'changed' into collection ids (intersecting bbox, if given)
+
+    'changed' refreshes the catalog snapshot and keeps the collections whose
+    last_modified moved since the previous refresh or since they were last
+    downloaded.
+    """
+    values = {value.lower() for value in requested}
+    if 'all' in values:
+        collections = client.get_collections()
+    elif 'changed' in values:
+        if snapshot is None:
+            raise ValueError("'--collections changed' needs a catalog snapshot (--snapshot)")
+        diff = snapshot.refresh(client)
+        changed = set(diff['changed']) | set(snapshot.changed_since_sync())
+        collections = [snapshot.collections[collection_id] for collection_id in sorted(changed)]
+    else:
+        return requested
+
+    if bbox is not None:
+        return BBoxIndex.from_collections(collections).query(bbox)
+    return [collection.get('id') for collection in collections if collection.get('id')]
+
+
+def item_summary(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Small machine-readable description of an item"""
+    properties = item.get('properties', {})
+    return {
+        "id": item.get('id'),
+        "collection": item.get('collection'),
+        "year": properties.get('year'),
+        "resolution": properties.get('resolution'),
+        "project": properties.get('project'),
+    }
+
+
+def download_event_handler(reporter: ProgressReporter, cog_pipeline: Optional[CogPipeline] = None):
+    """Translate downloader events into progress records
+
+    Completed files are handed to the COG pipeline, if any, so conversion
+    overlaps with the remaining downloads.
+    """
+
+    def on_event(event):
+        if event['event'] == 'waiting':
+            reporter.emit("waiting", **event['status'])
+            return
+        task = event['task']
+        item_id = task['item'].get('id')
+        if event['event'] == 'start':
+            reporter.emit("file_start", id=item_id, url=task['url'], path=task['path'])
+        elif event['event'] == 'progress':
+            reporter.emit("file_progress", id=item_id, percent=round(event['percent'], 1),
+                          downloaded=event['downloaded'], total=event['total'])
+        elif event['event'] == 'done':
+            reporter.emit("file_done", id=item_id, status=event['status'], path=task['path'],
+                          source=event.get('source'))
+            if cog_pipeline is not None and event['status'] == 'completed':
+                cog_pipeline.submit(task['path'])
+
+    return on_event
+
+
+def open_cache(args) -> Optional[SharedDownloadCache]:
+    """Shared download cache configured on the command line, if any"""
+    if not args.cache_dir:
+        return None
+    return SharedDownloadCache(args.cache_dir, args.cache_mode)
+
+
+def open_query_cache(args) -> Optional[QueryCache]:
+    """On-disk search result cache configured on the command line, if any"""
+    if not args.query_cache_dir:
+        return None
+    return QueryCache(args.query_cache_dir, ttl=args.query_cache_ttl)
+
+
+def open_snapshot(args) -> Optional[CatalogSnapshot]:
+    """Catalog snapshot configured on the command line, if any"""
+    if not args.snapshot:
+        return None
+    return CatalogSnapshot(args.snapshot)
+
+
+def open_cog_pipeline(args, reporter: ProgressReporter) -> Optional[CogPipeline]:
+    """COG conversion stage requested on the command line, if any"""
+    if not args.cog:
+        return None
+    return CogPipeline(args.cog_processes, on_result=lambda result: reporter.emit("cog_done", **result))
+
+
+def finish_cog_pipeline(cog_pipeline: Optional[CogPipeline]) -> Dict[str, int]:
+    """Wait for outstanding conversions"""
+    if cog_pipeline is None:
+        return {'completed': 0, 'failed': 0}
+    return cog_pipeline.wait()
+
+
+def run_search(args, client, reporter: ProgressReporter,
+               snapshot: Optional[CatalogSnapshot] = None) -> Optional[List[Dict[str, Any]]]:
+    """Run the search described by the CLI arguments, returning None on failure"""
+    if args.offline:
+        # The local mirror answers the search; files are still downloaded from the API
+        if not os.path.exists(args.mirror):
+            reporter.emit("search_failed", error=f"No catalog mirror at {args.mirror}; run sync first")
+            return None
+        with CatalogMirror(args.mirror) as mirror:
+            return _run_search(args, mirror, reporter, cache=None, snapshot=snapshot)
+    return _run_search(args, client, reporter, cache=open_query_cache(args), snapshot=snapshot)
+
+
+def _run_search(args, client, reporter: ProgressReporter, cache,
+                snapshot: Optional[CatalogSnapshot] = None) -> Optional[List[Dict[str, Any]]]:
+    bbox = parse_bbox(args.bbox) if args.bbox else None
+    try:
+        collections = resolve_collections(client, args.collections, bbox, snapshot or open_snapshot(args))
+    except Exception as e:
+        reporter.emit("search_failed", error=str(e))
+        return None
+    if not collections:
+        reporter.emit("search_failed", error="No collections to search")
+        return None
+
+    years = parse_years(args.years)
+    reporter.emit("search_started", collections=len(collections), years=years,
+                  resolutions=args.resolutions, projects=args.projects, bbox=bbox)
+    # Follow every page; a single request would stop at the server's page cap
+    results = []
+    number_matched = None
+    try:
+        for features, number_matched in iter_search_pages(client, collections, years=years,
+                                                          resolutions=args.resolutions, projects=args.projects,
+                                                          limit=args.limit, raise_errors=True, cache=cache,
+                                                          bbox=list(bbox) if bbox else None):
+            results.extend(features)
+    except Exception as e:
+        reporter.emit("search_failed", error=str(e))
+        return None
+
+    if number_matched is not None and number_matched > len(results):
+        print(f"Warning: {number_matched} items matched but only {len(results)} were returned; "
+              f"raise --limit to fetch the rest", file=sys.stderr)
+        reporter.emit("search_truncated", matched=number_matched, returned=len(results))
+    reporter.emit("search_completed", count=len(results))
+    return results
+
+
+def cmd_search(args, client, reporter: ProgressReporter) -> int:
+    """List matching items without downloading"""
+    results = run_search(args, client, reporter)
+    if results is None:
+        return EXIT_SEARCH_FAILED
+    if args.export:
+        # Results are full items here, so GeoJSON geometry needs no extra requests
+        store = ResultStore(results)
+        by_key = {item_key(item): item for item in results}
+        count = write_export(store, range(len(store)), args.export, columns=args.columns,
+                             hydrate=lambda summary: by_key.get(item_key(summary), summary))
+        reporter.emit("export_completed", path=args.export, count=count)
+    else:
+        for item in results:
+            reporter.emit("item", **item_summary(item))
+    return EXIT_OK if results else EXIT_NO_RESULTS
+
+
+def cmd_sync(args, client, reporter: ProgressReporter) -> int:
+    """Mirror the catalog into the local SQLite database"""
+    reporter.emit("sync_started", mirror=args.mirror)
+    with CatalogMirror(args.mirror) as mirror:
+        try:
+            summary = mirror.sync(client, args.collections,
+                                  progress=lambda event, fields: reporter.emit(event, **fields))
+        except Exception as e:
+            reporter.emit("sync_failed", error=str(e))
+            return EXIT_SEARCH_FAILED
+        reporter.emit("sync_completed", updated=len(summary['updated']), unchanged=summary['unchanged'],
+                      removed=len(summary['removed']), items=summary['items'], **mirror.stats())
+    return EXIT_OK
+
+
+def cmd_changed(args, client, reporter: ProgressReporter) -> int:
+    """Refresh the catalog snapshot and list the collections that changed"""
+    snapshot = CatalogSnapshot(args.snapshot)
+    first_refresh = snapshot.saved_at is None
+    try:
+        diff = snapshot.refresh(client)
+    except Exception as e:
+        reporter.emit("refresh_failed", error=str(e))
+        return EXIT_SEARCH_FAILED
+
+    changed_since_sync = snapshot.changed_since_sync()
+    if not first_refresh:
+        # On the first refresh every collection is new; listing them all says nothing
+        for status in ('added', 'changed', 'removed'):
+            for collection_id in diff[status]:
+                reporter.emit("collection_" + status, id=collection_id,
+                              last_modified=snapshot.collections.get(collection_id, {}).get('last_modified'))
+    for collection_id in changed_since_sync:
+        reporter.emit("collection_changed_since_sync", id=collection_id,
+                      synced=snapshot.synced.get(collection_id),
+                      last_modified=snapshot.collections[collection_id].get('last_modified'))
+    reporter.emit("refresh_completed", first_refresh=first_refresh, added=len(diff['added']),
+                  changed=len(diff['changed']), removed=len(diff['removed']),
+                  unchanged=diff['unchanged'], changed_since_sync=len(changed_since_sync))
+    return EXIT_OK
+
+
+def mark_synced(snapshot: CatalogSnapshot, client, collection_ids: List[str]):
+    """Record downloaded collections in the snapshot, refreshing it first if it lacks them"""
+    if not collection_ids:
+        return
+    try:
+        if any(collection_id not in snapshot.collections for collection_id in collection_ids):
+            snapshot.refresh(client)
+        snapshot.mark_synced(collection_ids)
+    except Exception as e:
+        print(f"Error updating catalog snapshot: {e}", file=sys.stderr)
+
+
+def cmd_download(args, client, reporter: ProgressReporter) -> int:
+    """Search and download matching items in parallel"""
+    snapshot = open_snapshot(args)
+    results = run_search(args, client, reporter, snapshot)
+    if results is None:
+        return EXIT_SEARCH_FAILED
+    if not results:
+        return EXIT_NO_RESULTS
+
+    os.makedirs(args.output, exist_ok=True)
+    tasks, unresolved = plan_downloads(results, args.output, not args.flat)
+    for item in unresolved:
+        reporter.emit("file_unresolved", **item_summary(item))
+
+    skipped_existing = 0
+    if args.skip_existing:
+        pending = [task for task in tasks if not os.path.exists(task['path'])]
+        skipped_existing = len(tasks) - len(pending)
+        tasks = pending
+
+    reporter.emit("download_started", files=len(tasks), workers=args.workers,
+                  output=os.path.abspath(args.output), skipped_existing=skipped_existing)
+    if args.dry_run:
+        for task in tasks:
+            reporter.emit("file_planned", id=task['item'].get('id'), url=task['url'], path=task['path'])
+        return EXIT_OK
+
+    start_time = time.time()
+    cog_pipeline = open_cog_pipeline(args, reporter)
+    sync_tracker = SyncTracker(tasks, unresolved)
+    report_event = download_event_handler(reporter, cog_pipeline)
+
+    def on_event(event):
+        sync_tracker.record(event)
+        report_event(event)
+
+    counts = download_tasks(client, tasks, workers=args.workers, on_event=on_event, cache=open_cache(args))
+    cog_counts = finish_cog_pipeline(cog_pipeline)
+    if snapshot is not None:
+        mark_synced(snapshot, client, sync_tracker.synced())
+    reporter.emit("summary", completed=counts['completed'], failed=counts['failed'],
+                  unresolved=len(unresolved), skipped_existing=skipped_existing,
+                  cog_converted=cog_counts['completed'], cog_failed=cog_counts['failed'],
+                  elapsed=round(time.time() - start_time, 1))
+
+    if counts['failed'] or unresolved or cog_counts['failed']:
+        return EXIT_DOWNLOAD_FAILED
+    return EXIT_OK
+
+
+def cmd_manifest_create(args, client, reporter: ProgressReporter) -> int:
+    """Search and write a shared work manifest for distributed workers"""
+    results = run_search(args, client, reporter)
+    if results is None:
+        return EXIT_SEARCH_FAILED
+    if not results:
+        return EXIT_NO_RESULTS
+
+    manifest = create_manifest(args.manifest, results, not args.flat)
+    reporter.emit("manifest_created", path=os.path.abspath(args.manifest),
+                  tasks=len(manifest['tasks']), unresolved=len(manifest['unresolved']))
+    return EXIT_OK
+
+
+def cmd_manifest_status(args, client, reporter: ProgressReporter) -> int:
+    """Report task counts of a shared work manifest"""
+    manifest = WorkManifest(args.manifest, stale_after=args.stale_after,
+                            max_attempts=args.max_attempts)
+    reporter.emit("manifest_status", **manifest.status())
+    return EXIT_OK
+
+
+def cmd_worker(args, client, reporter: ProgressReporter) -> int:
+    """Claim and download tasks from a shared work manifest"""
+    manifest = WorkManifest(args.manifest, stale_after=args.stale_after,
+                            max_attempts=args.max_attempts)
+    reporter.emit("worker_started", worker=manifest.worker_id, tasks=len(manifest.tasks),
+                  workers=args.workers, output=os.path.abspath(args.output))
+
+    os.makedirs(args.output, exist_ok=True)
+    start_time = time.time()
+    cog_pipeline = open_cog_pipeline(args, reporter)
+    counts = manifest.run_worker(client, args.output, workers=args.workers,
+                                 on_event=download_event_handler(reporter, cog_pipeline),
+                                 wait_for_others=not args.no_wait,
+                                 cache=open_cache(args))
+    cog_counts = finish_cog_pipeline(cog_pipeline)
+    status = manifest.status()
+    reporter.emit("summary", completed=counts['completed'], failed=counts['failed'],
+                  cog_converted=cog_counts['completed'], cog_failed=cog_counts['failed'],
+                  elapsed=round(time.time() - start_time, 1), manifest=status)
+
+    if counts['failed'] or status['failed'] or cog_counts['failed']:
+        return EXIT_DOWNLOAD_FAILED
+    return EXIT_OK
+
+
+def cmd_cog_benchmark(args, client, reporter: ProgressReporter) -> int:
+    """Measure windowed-read speedup of COG conversion on a downloaded GeoTIFF"""
+    for path in args.files:
+        reporter.emit("cog_benchmark", **benchmark_windowed_reads(
+            path, samples=args.samples, window_size=args.window_size))
+    return EXIT_OK
+
+
+def add_cog_arguments(parser: argparse.ArgumentParser):
+    """Arguments for the post-download COG conversion stage"""
+    parser.add_argument("--cog", action="store_true",
+                        help="Convert downloaded GeoTIFFs to Cloud-Optimized GeoTIFFs "
+                             "with overviews (requires rasterio)")
+    parser.add_argument("--cog-processes", type=int, default=None,
+                        help="Conversion processes (default: number of CPUs)")
+
+
+def add_manifest_arguments(parser: argparse.ArgumentParser):
+    """Arguments shared by commands that read a work manifest"""
+    parser.add_argument("--manifest", required=True,
+                        help="Shared manifest directory (e.g. on NFS)")
+    parser.add_argument("--stale-after", type=float, default=DEFAULT_STALE_AFTER,
+                        help=f"Seconds without heartbeat before a claim is recovered "
+                             f"(default {DEFAULT_STALE_AFTER})")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help=f"Failed attempts before a task is given up (default {DEFAULT_MAX_ATTEMPTS})")
+
+
+def add_cache_arguments(parser: argparse.ArgumentParser):
+    """Arguments for the shared read-through download cache"""
+    parser.add_argument("--cache-dir", default=SHARED_CACHE_DIR,
+                        help="Shared cache directory checked before downloading "
+                             "(defaults to WORLDPOP_CACHE_DIR; disabled if empty)")
+    parser.add_argument("--cache-mode", choices=CACHE_MODES, default=SHARED_CACHE_MODE,
+                        help="How cached files are placed in the output directory "
+                             f"(default {SHARED_CACHE_MODE})")
+
+
+def add_search_arguments(parser: argparse.ArgumentParser):
+    """Arguments shared by every command that runs a search"""
+    parser.add_argument("--collections", nargs="+", required=True, metavar="ID",
+                        help="Collection ids (e.g. country codes), 'all', or 'changed' for those "
+                             "updated since the last refresh or download")
+    parser.add_argument("--years", nargs="+", metavar="YEAR",
+                        help="Years, ranges or comma lists (e.g. 2020 2015-2018); all years if omitted")
+    parser.add_argument("--resolutions", nargs="+", choices=AVAILABLE_RESOLUTIONS,
+                        help="Resolutions to include; all if omitted")
+    parser.add_argument("--projects", nargs="+", choices=AVAILABLE_PROJECTS,
+                        help="Projects to include; all if omitted")
+    parser.add_argument("--bbox", nargs=4, type=float, metavar=("WEST", "SOUTH", "EAST", "NORTH"),
+                        help="Only items intersecting this box (WGS84 degrees); with "
+                             "'--collections all', only the countries it intersects are searched")
+    parser.add_argument("--limit", type=int, default=SEARCH_LIMIT,
+                        help=f"Maximum number of items (default {SEARCH_LIMIT})")
+    parser.add_argument("--query-cache-dir", default=QUERY_CACHE_DIR,
+                        help="Directory caching search results between runs "
+                             "(defaults to WORLDPOP_QUERY_CACHE_DIR; disabled if empty)")
+    parser.add_argument("--query-cache-ttl", type=int, default=QUERY_CACHE_TTL,
+                        help=f"Seconds a cached search stays valid (default {QUERY_CACHE_TTL})")
+    parser.add_argument("--offline", action="store_true",
+                        help="Search the local catalog mirror (see sync) instead of the API")
+    parser.add_argument("--mirror", default=MIRROR_PATH,
+                        help="Catalog mirror database (defaults to WORLDPOP_MIRROR)")
+    add_snapshot_argument(parser)
+
+
+def add_snapshot_argument(parser: argparse.ArgumentParser):
+    """Catalog snapshot location, for '--collections changed' and the changed command"""
+    parser.add_argument("--snapshot", default=CATALOG_SNAPSHOT_PATH,
+                        help="Catalog snapshot file remembering last_modified per collection "
+                             "(defaults to WORLDPOP_CATALOG_SNAPSHOT; disabled if empty)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser"""
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Headless WorldPop STAC search and download")
+    parser.add_argument("--api-url", default=API_BASE_URL, help="STAC API base URL")
+    parser.add_argument("--api-key", default=API_KEY,
+                        help="API key (defaults to WORLDPOP_API_KEY)")
+    parser.add_argument("--progress", choices=["json", "text"], default="json",
+                        help="Progress output format on stdout (default json)")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    search_parser = subparsers.add_parser("search", help="List matching items")
+    add_search_arguments(search_parser)
+    search_parser.add_argument("--export", metavar="FILE",
+                               help="Write results to a .csv, .geojsonl or .parquet file "
+                                    "instead of listing them")
+    search_parser.add_argument("--columns", nargs="+", choices=list(EXPORT_COLUMNS),
+                               default=DEFAULT_EXPORT_COLUMNS, help="Columns to export")
+    search_parser.set_defaults(handler=cmd_search)
+
+    sync_parser = subparsers.add_parser("sync", help="Mirror the catalog for offline searches")
+    sync_parser.add_argument("--mirror", default=MIRROR_PATH,
+                             help=f"Catalog mirror database (default {MIRROR_PATH})")
+    sync_parser.add_argument("--collections", nargs="+", metavar="ID",
+                             help="Only sync these collections; all if omitted")
+    sync_parser.set_defaults(handler=cmd_sync)
+
+    changed_parser = subparsers.add_parser("changed",
+                                           help="Refresh the collection list and show what changed")
+    add_snapshot_argument(changed_parser)
+    changed_parser.set_defaults(handler=cmd_changed)
+
+    download_parser = subparsers.add_parser("download", help="Search and download matching items")
+    add_search_arguments(download_parser)
+    download_parser.add_argument("--output", default=DEFAULT_DOWNLOAD_DIR,
+                                 help=f"Download directory (default {DEFAULT_DOWNLOAD_DIR})")
+    download_parser.add_argument("--workers", type=int, default=DOWNLOAD_WORKERS,
+                                 help=f"Parallel downloads (default {DOWNLOAD_WORKERS})")
+    download_parser.add_argument("--flat", action="store_true",
+                                 help="Do not create country/year subfolders")
+    download_parser.add_argument("--skip-existing", action="store_true",
+                                 help="Skip files that already exist locally")
+    download_parser.add_argument("--dry-run", action="store_true",
+                                 help="Plan downloads without fetching anything")
+    add_cache_arguments(download_parser)
+    add_cog_arguments(download_parser)
+    download_parser.set_defaults(handler=cmd_download)
+
+    create_parser = subparsers.add_parser("manifest-create",
+                                          help="Search and write a shared work manifest")
+    add_search_arguments(create_parser)
+    create_parser.add_argument("--manifest", required=True,
+                               help="Shared manifest directory (e.g. on NFS)")
+    create_parser.add_argument("--flat", action="store_true",
+                               help="Do not create country/year subfolders")
+    create_parser.set_defaults(handler=cmd_manifest_create)
+
+    status_parser = subparsers.add_parser("manifest-status", help="Show work manifest progress")
+    add_manifest_arguments(status_parser)
+    status_parser.set_defaults(handler=cmd_manifest_status)
+
+    worker_parser = subparsers.add_parser("worker",
+                                          help="Claim and download tasks from a shared manifest")
+    add_manifest_arguments(worker_parser)
+    worker_parser.add_argument("--output", default=DEFAULT_DOWNLOAD_DIR,
+                               help=f"Download directory (default {DEFAULT_DOWNLOAD_DIR})")
+    worker_parser.add_argument("--workers", type=int, default=DOWNLOAD_WORKERS,
+                               help=f"Parallel downloads on this host (default {DOWNLOAD_WORKERS})")
+    worker_parser.add_argument("--no-wait", action="store_true",
+                               help="Exit when nothing is claimable instead of waiting to "
+                                    "recover claims held by other workers")
+    add_cache_arguments(worker_parser)
+    add_cog_arguments(worker_parser)
+    worker_parser.set_defaults(handler=cmd_worker)
+
+    benchmark_parser = subparsers.add_parser("cog-benchmark",
+                                             help="Compare windowed-read speed before and after COG conversion")
+    benchmark_parser.add_argument("files", nargs="+", help="Downloaded GeoTIFF files")
+    benchmark_parser.add_argument("--samples", type=int, default=200,
+                                  help="Random windows to read (default 200)")
+    benchmark_parser.add_argument("--window-size", type=int, default=256,
+                                  help="Window width and height in pixels (default 256)")
+    benchmark_parser.set_defaults(handler=cmd_cog_benchmark)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point, returns the process exit code"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    reporter = ProgressReporter(args.progress, sys.stdout)
+    client = WorldPopSTACClient(args.api_url, args.api_key)
+
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            return args.handler(args, client, reporter)
+    except ValueError as e:
+        print(f"Invalid argument: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    except KeyboardInterrupt:
+        reporter.emit("interrupted")
+        return EXIT_DOWNLOAD_FAILED
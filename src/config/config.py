@@ -14,4 +14,22 @@ AVAILABLE_PROJECTS = ["Population", "Age and Sex Structures"]
 
 # Download settings
 DEFAULT_DOWNLOAD_DIR = os.path.join(os.path.expanduser("~"), "Downloads", "WorldPop_Data")
-CHUNK_SIZE = 8192  # 8KB chunks for downloading
\ No newline at end of file
+CHUNK_SIZE = 8192  # 8KB chunks for downloading
+DOWNLOAD_WORKERS = 4  # Parallel file downloads
+
+# Shared read-through download cache (e.g. an NFS/SMB mount); empty disables it
+SHARED_CACHE_DIR = os.getenv("WORLDPOP_CACHE_DIR", "")
+SHARED_CACHE_MODE = os.getenv("WORLDPOP_CACHE_MODE", "copy")  # copy, link or symlink
+
+# Search result cache; results are kept in memory and, if a directory is set, on disk
+QUERY_CACHE_DIR = os.getenv("WORLDPOP_QUERY_CACHE_DIR", "")
+QUERY_CACHE_TTL = int(os.getenv("WORLDPOP_QUERY_CACHE_TTL", "3600"))  # Seconds
+QUERY_CACHE_MEMORY_MB = 64
+QUERY_CACHE_DISK_MB = 512
+
+# Offline SQLite mirror of the catalog, filled by "cli.py sync"
+MIRROR_PATH = os.getenv("WORLDPOP_MIRROR", os.path.join(os.path.expanduser("~"), ".worldpop", "catalog.sqlite"))
+
+# Last seen collection list and per-collection sync markers, for incremental catalog refresh
+CATALOG_SNAPSHOT_PATH = os.getenv("WORLDPOP_CATALOG_SNAPSHOT",
+                                  os.path.join(os.path.expanduser("~"), ".worldpop", "catalog_snapshot.json"))
@@ -1,10 +1,16 @@
 """
 STAC API Client for WorldPop Desktop App
 """
-from typing import Dict, List, Optional, Any
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Any
 
 import requests
 
+from src.core.cancel import CancelToken, OperationCancelled
+
+SEARCH_READ_CHUNK = 64 * 1024  # Bytes read between cancel checks
+
 
 class WorldPopSTACClient:
     def __init__(self, base_url: str, api_key: str = ""):
@@ -43,8 +49,13 @@ class WorldPopSTACClient:
                      query: Dict[str, Any] = None,
                      filter_expr: str = None,
                      filter_lang: str = None,
-                     limit: int = 100) -> List[Dict[str, Any]]:
-        """Search for STAC items with filters"""
+                     limit: int = 100,
+                     raise_errors: bool = False) -> List[Dict[str, Any]]:
+        """Search for STAC items with filters
+
+        Errors are logged and an empty list returned unless raise_errors is set,
+        which lets callers tell a failed search apart from an empty one.
+        """
         search_params = {
             "limit": limit
         }
@@ -78,8 +89,83 @@ class WorldPopSTACClient:
             print(f"Error searching items: {e}")
             if hasattr(e, 'response') and e.response is not None:
                 print(f"Error response: {e.response.text}")
+            if raise_errors:
+                raise
             return []
 
+    def search_pages(self, collections: List[str] = None,
+                     filter_expr: Dict[str, Any] = None,
+                     filter_lang: str = None,
+                     limit: int = 1000,
+                     bbox: List[float] = None,
+                     raise_errors: bool = False,
+                     cancel: Optional[CancelToken] = None) -> Iterator[Dict[str, Any]]:
+        """Search for STAC items page by page, following 'next' links
+
+        Yields each response body (with 'features' and, if the server reports
+        it, 'numberMatched') as soon as it arrives. Cancelling the token closes
+        the response being read and raises OperationCancelled.
+        """
+        search_params = {"limit": limit}
+        if collections:
+            search_params["collections"] = collections
+        if bbox:
+            search_params["bbox"] = bbox
+        if filter_expr:
+            search_params["filter"] = filter_expr
+        if filter_lang:
+            search_params["filter-lang"] = filter_lang
+
+        method, url, body = "POST", f"{self.base_url}/search", search_params
+        while url:
+            if cancel is not None:
+                cancel.check()
+            try:
+                # Streamed, so a cancel can close the connection mid-transfer
+                if method == "POST":
+                    response = self.session.post(url, json=body, stream=True)
+                else:
+                    response = self.session.get(url, stream=True)
+                unregister = cancel.register(response.close) if cancel is not None else None
+                try:
+                    response.raise_for_status()
+                    chunks = []
+                    for chunk in response.iter_content(SEARCH_READ_CHUNK):
+                        if cancel is not None:
+                            cancel.check()
+                        chunks.append(chunk)
+                    page = json.loads(b"".join(chunks))
+                finally:
+                    if unregister is not None:
+                        unregister()
+                    response.close()
+            except OperationCancelled:
+                raise
+            except Exception as e:
+                if cancel is not None and cancel.cancelled:
+                    # Reading a response closed by cancel() fails in various ways
+                    raise OperationCancelled() from None
+                if not isinstance(e, (requests.RequestException, ValueError)):
+                    raise
+                print(f"Error searching items: {e}")
+                if raise_errors:
+                    raise
+                return
+
+            yield page
+            if not page.get("features"):
+                return
+
+            # Follow the next link; POST links carry a body, optionally merged into the original
+            next_link = next((link for link in page.get("links", []) if link.get("rel") == "next"), None)
+            if next_link is None:
+                return
+            url = next_link.get("href")
+            method = next_link.get("method", "GET").upper()
+            if method == "POST":
+                link_body = next_link.get("body", {})
+                body = {**search_params, **link_body} if next_link.get("merge") else link_body
+
     def get_item(self, collection_id: str, item_id: str) -> Optional[Dict[str, Any]]:
         """Get specific item"""
         try:
@@ -92,8 +178,27 @@ class WorldPopSTACClient:
             print(f"Error fetching item {item_id}: {e}")
             return None
 
+    def get_remote_metadata(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get ETag, Last-Modified and size of a remote file with a HEAD request"""
+        try:
+            response = self.session.head(url, allow_redirects=True)
+            response.raise_for_status()
+            return {
+                'etag': response.headers.get('ETag', ''),
+                'last_modified': response.headers.get('Last-Modified', ''),
+                'content_length': int(response.headers.get('content-length', 0) or 0),
+            }
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error fetching metadata for {url}: {e}")
+            return None
+
     def download_file(self, url: str, local_path: str, progress_callback=None) -> bool:
-        """Download file from URL with progress callback"""
+        """Download file from URL with progress callback
+
+        Data is written to a '.part' file that is only renamed into place once
+        complete, so an interrupted download never looks like a finished file.
+        """
+        part_path = local_path + '.part'
         try:
             response = self.session.get(url, stream=True)
             response.raise_for_status()
@@ -101,7 +206,7 @@ class WorldPopSTACClient:
             total_size = int(response.headers.get('content-length', 0))
             downloaded = 0
 
-            with open(local_path, 'wb') as f:
+            with open(part_path, 'wb') as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     if chunk:
                         f.write(chunk)
@@ -111,7 +216,12 @@ class WorldPopSTACClient:
                             progress = (downloaded / total_size * 100) if total_size > 0 else 0
                             progress_callback(progress, downloaded, total_size)
 
+            os.replace(part_path, local_path)
             return True
         except Exception as e:
             print(f"Error downloading {url}: {e}")
+            try:
+                os.remove(part_path)
+            except OSError:
+                pass
             return False
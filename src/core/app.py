@@ -12,15 +12,27 @@ from PIL import Image, ImageTk
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.config.config import (
-    API_BASE_URL, API_KEY, DEFAULT_DOWNLOAD_DIR
+    API_BASE_URL, API_KEY, DEFAULT_DOWNLOAD_DIR, SHARED_CACHE_DIR,
+    QUERY_CACHE_DIR, QUERY_CACHE_TTL, QUERY_CACHE_MEMORY_MB, QUERY_CACHE_DISK_MB, MIRROR_PATH,
+    CATALOG_SNAPSHOT_PATH
 )
 from src.core.api_client import WorldPopSTACClient
+from src.core.catalog_snapshot import CatalogSnapshot
+from src.core.hydration import ItemHydrator
+from src.core.mirror import CatalogMirror
 
 from src.core.operations import AppOperations
+from src.core.query_cache import QueryCache
+from src.core.result_store import ResultStore
+from src.core.app_state import AppState
+from src.core.collection_index import CollectionIndex
+from src.core.selection import SelectionSet
+from src.core.spatial import BBoxIndex
 from src.ui.filter_tab import setup_enhanced_filter_tab
 from src.ui.results_tab import setup_enhanced_results_tab
 from src.ui.download_tab import setup_enhanced_download_tab
 from src.ui.about_tab import setup_about_tab
+from src.utils.incremental_tree import IncrementalRenderer
 
 
 class WorldPopApp(AppOperations):
@@ -30,12 +42,41 @@ class WorldPopApp(AppOperations):
 
         # Initialize API client
         self.client = WorldPopSTACClient(API_BASE_URL, API_KEY)
+        # Offline catalog mirror, if "cli.py sync" has created one
+        self.mirror = CatalogMirror(MIRROR_PATH) if os.path.exists(MIRROR_PATH) else None
+        self.offline_var = tk.BooleanVar(value=False)  # Search the mirror instead of the API
+        # Full items on demand; results keep summaries
+        self.hydrator = ItemHydrator(self.client, local_lookup=self.mirror.get_item if self.mirror else None)
+        # Going back to an earlier search replays it from here instead of the API
+        self.query_cache = QueryCache(QUERY_CACHE_DIR or None, ttl=QUERY_CACHE_TTL,
+                                      max_memory_bytes=QUERY_CACHE_MEMORY_MB * 1024 * 1024,
+                                      max_disk_bytes=QUERY_CACHE_DISK_MB * 1024 * 1024)
 
         # State variables
         self.collections = []
-        self.search_results = []
-        self.selected_items = []
+        self.collection_index = CollectionIndex([])
+        self.collection_bbox_index = BBoxIndex([])  # Collection extents, for region selection
+        self.catalog_snapshot = CatalogSnapshot(CATALOG_SNAPSHOT_PATH)  # Shown at launch, then refreshed
+        self.changed_collection_ids = set()  # Collections flagged as changed since the last sync
+        self.visible_collection_ids = []  # Collection IDs shown in the tree, in display order
+        self.filter_after_id = None  # Pending debounced collection filter
+        self.search_generation = 0  # Bumped per search; late results of older searches are dropped
+        self.search_cancel = None  # CancelToken of the search in flight
+        self.export_cancel = None  # CancelToken of the export in flight; the Export button cancels it
+        self.app_state = AppState()  # Collection ticks and sidebar counters
+        self.result_store = ResultStore()  # Columnar store of the last API search
+        self.result_offsets = []  # Store offsets shown in the results tab (after local refinement)
+        self.fetched_query = None  # Facet selection that result_store answers
+        self.fetched_bbox = None  # Region the fetched results were limited to
+        self.facet_index = None
+        self.selected_items = SelectionSet()  # Keyed by (collection, item id)
+        self.selected_rows = {}  # item key -> selected_tree row, for O(1) status updates
         self.download_dir = tk.StringVar(value=DEFAULT_DOWNLOAD_DIR)
+        self.cache_dir = tk.StringVar(value=SHARED_CACHE_DIR)
+
+        # Large trees are filled in idle-time batches; a new fill cancels the previous one
+        self.collections_renderer = IncrementalRenderer(self.root, on_progress=self.show_render_progress)
+        self.selected_renderer = IncrementalRenderer(self.root, on_progress=self.show_render_progress)
 
         # UI Theme colors
         self.colors = {
@@ -52,6 +93,12 @@ class WorldPopApp(AppOperations):
 
         self.setup_styles()
         self.setup_ui()
+        self.selected_items.add_listener(self.on_selection_changed)
+        self.app_state.add_listener(lambda state: self.update_stats())
+        # Facet counts depend only on the result set and the ticked collections, not on every counter
+        self.app_state.add_listener(lambda state: self.update_facet_counts(),
+                                    keys=('result_count', 'selected_collections'))
+        self.update_stats()
         self.load_collections()
 
     def setup_window(self):
@@ -181,9 +228,6 @@ class WorldPopApp(AppOperations):
         setup_enhanced_download_tab(self)
         setup_about_tab(self)
 
-        # Bind tab change event
-        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
-
     def setup_footer(self):
         """Setup application footer with status information"""
         footer_frame = ttk.Frame(self.root)
@@ -266,27 +310,8 @@ class WorldPopApp(AppOperations):
             ttk.Label(logo_placeholder, text="Company\nLogo",
                       font=('Arial', 8), style='Info.TLabel').pack(padx=10, pady=(0, 10))
 
-    def on_tab_changed(self, event):
-        """Handle tab change events"""
-        selected_tab = event.widget.tab('current')['text']
-        if "Results" in selected_tab:
-            self.update_stats()
-        elif "Downloads" in selected_tab:
-            self.update_selected_tree()
-
     def update_stats(self):
-        """Update statistics in sidebar"""
-        # Count visible collections in tree
-        visible_collections = len(self.collections_tree.get_children())
-
-        # Count selected collections 
-        selected_collections = 0
-        for item in self.collections_tree.get_children():
-            if self.collections_tree.item(item, 'text') == '☑':
-                selected_collections += 1
-
-        # Update labels
-        self.stats_collections.config(text=str(visible_collections))
-        if hasattr(self, 'stats_results'):
-            self.stats_results.config(text=str(len(self.search_results)))
-        self.stats_selected.config(text=str(selected_collections))
+        """Update statistics in sidebar from the state model"""
+        self.stats_collections.config(text=str(self.app_state.visible_collections))
+        self.stats_results.config(text=str(self.app_state.result_count))
+        self.stats_selected.config(text=str(self.app_state.selected_collection_count))
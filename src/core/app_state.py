@@ -0,0 +1,71 @@
+"""
+Application State Model - collection selection and sidebar counters
+
+Operations update the counters as they change things and listeners redraw
+the statistics labels, so nothing has to rescan the trees to count rows.
+"""
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+COUNTERS = ('visible_collections', 'result_count', 'selected_item_count')
+
+
+class AppState:
+    """Observable selection and counter state shared by the GUI views"""
+
+    def __init__(self):
+        self.selected_collections: Set[str] = set()
+        self.visible_collections = 0
+        self.result_count = 0
+        self.selected_item_count = 0
+        self._listeners: List[Tuple[Callable[['AppState'], None], Optional[Set[str]]]] = []
+
+    def add_listener(self, listener: Callable[['AppState'], None], keys: Optional[Iterable[str]] = None):
+        """Call listener(state) after every change, or only after changes to keys
+
+        keys are COUNTERS names or 'selected_collections'.
+        """
+        self._listeners.append((listener, set(keys) if keys is not None else None))
+
+    def _notify(self, key: str):
+        for listener, keys in self._listeners:
+            if keys is None or key in keys:
+                listener(self)
+
+    def set_count(self, name: str, value: int):
+        """Set one of the COUNTERS, notifying only if it changed"""
+        if name not in COUNTERS:
+            raise ValueError(f"Unknown counter: {name}")
+        if getattr(self, name) != value:
+            setattr(self, name, value)
+            self._notify(name)
+
+    @property
+    def selected_collection_count(self) -> int:
+        return len(self.selected_collections)
+
+    def is_collection_selected(self, collection_id: str) -> bool:
+        return collection_id in self.selected_collections
+
+    def toggle_collection(self, collection_id: str) -> bool:
+        """Tick or untick a collection; returns the new state"""
+        if collection_id in self.selected_collections:
+            self.selected_collections.discard(collection_id)
+            selected = False
+        else:
+            self.selected_collections.add(collection_id)
+            selected = True
+        self._notify('selected_collections')
+        return selected
+
+    def select_collections(self, collection_ids: Iterable[str]):
+        """Tick several collections at once"""
+        count = len(self.selected_collections)
+        self.selected_collections.update(collection_ids)
+        if len(self.selected_collections) != count:
+            self._notify('selected_collections')
+
+    def clear_collections(self):
+        """Untick every collection"""
+        if self.selected_collections:
+            self.selected_collections.clear()
+            self._notify('selected_collections')
@@ -0,0 +1,194 @@
+"""
+Shared Download Cache - read-through cache on a shared directory (NFS/SMB)
+
+Files are keyed by asset URL and the server's ETag (falling back to
+Last-Modified and size), so a changed file on the server is fetched again
+while unchanged files cross the WAN only once per site. A lock file per key
+makes sure only one user fetches a given file at a time; everyone else waits
+for it to land in the cache and then copies or links it.
+"""
+import hashlib
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+from typing import Dict, Any, Optional
+
+CACHE_MODES = ('copy', 'link', 'symlink')
+LOCK_STALE_AFTER = 120  # Seconds without lock heartbeat before it is taken over
+LOCK_POLL_INTERVAL = 2
+LOCK_WAIT_TIMEOUT = 6 * 3600
+
+
+class SharedDownloadCache:
+    """Read-through file cache keyed by URL and ETag"""
+
+    def __init__(self, cache_dir: str, mode: str = 'copy'):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode}")
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        self.locks_dir = os.path.join(cache_dir, 'locks')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.locks_dir, exist_ok=True)
+
+    @staticmethod
+    def has_validator(metadata: Optional[Dict[str, Any]]) -> bool:
+        """Whether the server told us enough to notice when the file changes"""
+        metadata = metadata or {}
+        return any(metadata.get(name) for name in ('etag', 'last_modified', 'content_length'))
+
+    @staticmethod
+    def cache_key(url: str, metadata: Optional[Dict[str, Any]]) -> str:
+        """Hash of the URL and the best validator the server offered"""
+        metadata = metadata or {}
+        validator = metadata.get('etag') or f"{metadata.get('last_modified', '')}:{metadata.get('content_length', '')}"
+        return hashlib.sha256(f"{url}\0{validator}".encode('utf-8')).hexdigest()
+
+    def _object_path(self, key: str) -> str:
+        return os.path.join(self.objects_dir, key[:2], key)
+
+    def _lock_path(self, key: str) -> str:
+        return os.path.join(self.locks_dir, f"{key}.lock")
+
+    def _try_lock(self, key: str) -> bool:
+        """Take the fetch lock for a key, taking over locks whose holder stopped"""
+        lock_path = self._lock_path(key)
+        for _ in range(2):
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                try:
+                    age = time.time() - os.stat(lock_path).st_mtime
+                except OSError:
+                    return False  # Released meanwhile; caller polls again
+                if age < LOCK_STALE_AFTER:
+                    return False
+                # Stale lock: rename it away; only one contender's rename succeeds
+                stale_path = f"{lock_path}.stale.{socket.gethostname()}.{os.getpid()}.{threading.get_ident()}"
+                try:
+                    os.rename(lock_path, stale_path)
+                    if time.time() - os.stat(stale_path).st_mtime < LOCK_STALE_AFTER:
+                        # Lost a race and took a fresh lock; give it back to its owner
+                        try:
+                            os.link(stale_path, lock_path)
+                        except OSError:
+                            pass
+                        os.remove(stale_path)
+                        return False
+                    os.remove(stale_path)
+                except OSError:
+                    return False
+                continue
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'host': socket.gethostname(), 'pid': os.getpid(), 'owner': self._owner(),
+                           'locked_at': time.time()}, f)
+            return True
+        return False
+
+    @staticmethod
+    def _owner() -> str:
+        """Lock owner id; fetch() locks and unlocks on the same thread"""
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+    def _unlock(self, key: str):
+        """Release our fetch lock, unless it went stale and another user took it over"""
+        lock_path = self._lock_path(key)
+        try:
+            with open(lock_path, 'r', encoding='utf-8') as f:
+                owner = json.load(f).get('owner')
+        except (OSError, ValueError):
+            return
+        if owner != self._owner():
+            return
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+
+    def _materialize(self, object_path: str, local_path: str):
+        """Place a cached object at the requested local path"""
+        if os.path.lexists(local_path):
+            os.remove(local_path)
+        if self.mode == 'symlink':
+            os.symlink(os.path.abspath(object_path), local_path)
+            return
+        if self.mode == 'link':
+            try:
+                os.link(object_path, local_path)
+                return
+            except OSError:
+                pass  # Different filesystem or no hardlink support; copy instead
+        part_path = local_path + '.part'
+        shutil.copyfile(object_path, part_path)
+        os.replace(part_path, local_path)
+
+    def _fill(self, client, url: str, key: str, metadata: Optional[Dict[str, Any]],
+              progress_callback=None) -> bool:
+        """Download into the cache while holding the lock for key"""
+        object_path = self._object_path(key)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        lock_path = self._lock_path(key)
+        last_heartbeat = [time.time()]
+
+        def callback(progress, downloaded, total):
+            # Keep the lock fresh so waiting users do not take it over
+            now = time.time()
+            if now - last_heartbeat[0] > LOCK_STALE_AFTER / 4:
+                last_heartbeat[0] = now
+                try:
+                    os.utime(lock_path)
+                except OSError:
+                    pass
+            if progress_callback:
+                progress_callback(progress, downloaded, total)
+
+        if not client.download_file(url, object_path, callback):
+            return False
+        with open(object_path + '.json', 'w', encoding='utf-8') as f:
+            json.dump({'url': url, 'metadata': metadata, 'cached_at': time.time()}, f)
+        return True
+
+    def fetch(self, client, url: str, local_path: str, progress_callback=None) -> Optional[str]:
+        """Fetch url to local_path through the cache
+
+        Returns 'cache' on a hit, 'network' when this call filled the cache, or
+        None if the file could not be fetched.
+        """
+        metadata = client.get_remote_metadata(url)
+        if not self.has_validator(metadata):
+            # HEAD failed or returned nothing to tell versions apart; a cached copy could be stale forever
+            if not client.download_file(url, local_path, progress_callback):
+                return None
+            return 'network'
+        key = self.cache_key(url, metadata)
+        object_path = self._object_path(key)
+        deadline = time.time() + LOCK_WAIT_TIMEOUT
+
+        while time.time() < deadline:
+            if os.path.exists(object_path):
+                self._materialize(object_path, local_path)
+                if progress_callback:
+                    size = os.path.getsize(local_path)
+                    progress_callback(100, size, size)
+                return 'cache'
+
+            if self._try_lock(key):
+                try:
+                    # Another user may have filled it just before we got the lock
+                    if not os.path.exists(object_path):
+                        if not self._fill(client, url, key, metadata, progress_callback):
+                            return None
+                        self._materialize(object_path, local_path)
+                        return 'network'
+                finally:
+                    self._unlock(key)
+                continue
+
+            time.sleep(LOCK_POLL_INTERVAL)
+
+        print(f"Timed out waiting for cache lock on {url}")
+        return None
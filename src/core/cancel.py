@@ -0,0 +1,59 @@
+"""
+Cancellation - tokens for stopping background work from another thread
+
+Whoever starts the work keeps the token and calls cancel(); the worker checks
+it between steps and registers callbacks (e.g. closing an HTTP response) to
+interrupt a step that is blocked. Shared by the GUI and the CLI, so no
+tkinter here.
+"""
+import threading
+from typing import Callable, List
+
+
+class OperationCancelled(Exception):
+    """Raised by work that stopped because its token was cancelled"""
+
+
+class CancelToken:
+    """One-shot, thread-safe cancellation flag with callbacks"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        """Set the flag and run the registered callbacks (once)"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in cancel callback: {e}")
+
+    def check(self):
+        """Raise OperationCancelled if the token was cancelled"""
+        if self._event.is_set():
+            raise OperationCancelled()
+
+    def register(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run callback on cancel (now, if already cancelled); returns an unregister function"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        callback()
+        return lambda: None
+
+    def _unregister(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
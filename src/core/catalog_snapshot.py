@@ -0,0 +1,125 @@
+"""
+Catalog Snapshot - the last seen collection list, persisted between runs
+
+The snapshot lets the app show the catalog at once on launch and tells a
+refresh which collections changed, by comparing last_modified. It also
+remembers, per collection, the last_modified at the time it was last synced
+(downloaded), so collections whose data changed since can be flagged in the
+GUI and targeted by re-download jobs. Shared by the GUI and the CLI, so no
+tkinter here.
+"""
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Any, Optional
+
+
+def last_modified(collection: Dict[str, Any]) -> Optional[str]:
+    return collection.get('last_modified')
+
+
+class CatalogSnapshot:
+    """Collections by id plus per-collection sync markers, saved as one JSON file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.collections: Dict[str, Dict[str, Any]] = {}
+        self.synced: Dict[str, Optional[str]] = {}  # Collection id -> last_modified when last synced
+        self.saved_at: Optional[float] = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Error reading catalog snapshot: {e}")
+            return
+        self.collections = data.get('collections', {})
+        self.synced = data.get('synced', {})
+        self.saved_at = data.get('saved_at')
+
+    def save(self):
+        """Write the snapshot atomically"""
+        with self.lock:
+            self.saved_at = time.time()
+            data = {'saved_at': self.saved_at, 'collections': self.collections, 'synced': self.synced}
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temp_path = f"{self.path}.tmp.{os.getpid()}.{threading.get_ident()}"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+
+    def list_collections(self) -> List[Dict[str, Any]]:
+        return list(self.collections.values())
+
+    def diff(self, collections: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Collection ids added, changed (last_modified differs) and removed relative to the snapshot"""
+        current = {collection.get('id'): collection for collection in collections if collection.get('id')}
+        added = sorted(set(current) - set(self.collections))
+        removed = sorted(set(self.collections) - set(current))
+        changed = sorted(collection_id for collection_id in set(current) & set(self.collections)
+                         if last_modified(current[collection_id]) != last_modified(self.collections[collection_id]))
+        return {'added': added, 'changed': changed, 'removed': removed,
+                'unchanged': len(current) - len(added) - len(changed)}
+
+    def apply(self, collections: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Replace the snapshot with a freshly fetched collection list, save it and return the diff"""
+        diff = self.diff(collections)
+        with self.lock:
+            self.collections = {collection['id']: collection for collection in collections if collection.get('id')}
+        self.save()
+        return diff
+
+    def refresh(self, client) -> Dict[str, Any]:
+        """Fetch the collection list from the API and apply it"""
+        collections = client.get_collections()
+        if not collections:
+            raise RuntimeError("No collections returned by the API")
+        return self.apply(collections)
+
+    def changed_since_sync(self) -> List[str]:
+        """Synced collections whose last_modified has changed since they were synced"""
+        with self.lock:
+            return sorted(collection_id for collection_id, synced in self.synced.items()
+                          if collection_id in self.collections
+                          and last_modified(self.collections[collection_id]) != synced)
+
+    def mark_synced(self, collection_ids: Iterable[str]):
+        """Record the current last_modified of collections that were just synced"""
+        with self.lock:
+            for collection_id in collection_ids:
+                if collection_id in self.collections:
+                    self.synced[collection_id] = last_modified(self.collections[collection_id])
+        self.save()
+
+
+class SyncTracker:
+    """Download outcomes per collection; a collection is synced once all its tasks completed"""
+
+    def __init__(self, tasks: Iterable[Dict[str, Any]], unresolved: Iterable[Dict[str, Any]] = ()):
+        self.lock = threading.Lock()
+        self.pending = Counter(task['item'].get('collection') for task in tasks)
+        self.failed = {item.get('collection') for item in unresolved}
+
+    def record(self, event: Dict[str, Any]):
+        """Count a downloader event (see download_tasks)"""
+        if event['event'] != 'done':
+            return
+        collection_id = event['task']['item'].get('collection')
+        with self.lock:
+            if event['status'] == 'completed':
+                self.pending[collection_id] -= 1
+            else:
+                self.failed.add(collection_id)
+
+    def synced(self) -> List[str]:
+        """Collections whose every planned file completed"""
+        with self.lock:
+            return sorted(collection_id for collection_id, count in self.pending.items()
+                          if collection_id and count <= 0 and collection_id not in self.failed)
@@ -0,0 +1,182 @@
+"""
+Collection Index - display rows and a ranked search index built once per catalog load
+
+Collections are found by title, ID (ISO3 code), STAC keywords and common
+alternative country names, ignoring case and accents. Word prefixes and
+trigrams are indexed, so each query only looks at candidate collections and
+results come back ranked best match first.
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+# Alternative names for countries whose official title is hard to guess, by ISO3 code
+COUNTRY_ALIASES = {
+    'CIV': ['Ivory Coast'],
+    'COD': ['DRC', 'Congo Kinshasa', 'Zaire'],
+    'COG': ['Congo Brazzaville'],
+    'CZE': ['Czech Republic'],
+    'GBR': ['UK', 'Britain', 'Great Britain', 'England'],
+    'USA': ['US', 'America', 'United States'],
+    'MMR': ['Burma'],
+    'SWZ': ['Swaziland'],
+    'TLS': ['East Timor'],
+    'CPV': ['Cape Verde'],
+    'MKD': ['Macedonia'],
+    'NLD': ['Holland'],
+    'KOR': ['South Korea'],
+    'PRK': ['North Korea'],
+    'LAO': ['Laos'],
+    'IRN': ['Persia'],
+    'RUS': ['Russia'],
+    'SYR': ['Syria'],
+    'TZA': ['Tanzania'],
+    'VNM': ['Vietnam'],
+    'BOL': ['Bolivia'],
+    'VEN': ['Venezuela'],
+    'FSM': ['Micronesia'],
+    'PSE': ['Palestine'],
+    'TUR': ['Turkey'],
+}
+
+# Match scores, best first; fuzzy trigram matches score below all of these
+SCORE_EXACT_ID = 100
+SCORE_TITLE_PREFIX = 90
+SCORE_WORD_PREFIX = 80
+SCORE_ALIAS_PREFIX = 70
+SCORE_SUBSTRING = 60
+SCORE_FUZZY = 40
+FUZZY_THRESHOLD = 0.5  # Minimum share of the query's trigrams found in a fuzzy match
+FUZZY_MIN_LENGTH = 4  # Shorter queries are too ambiguous for fuzzy matching
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents, so 'Côte' matches 'cote'"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def format_last_modified(value: Any) -> str:
+    """Collection last_modified as YYYY-MM-DD for display"""
+    last_updated = value or "Unknown"
+
+    # Format date if it's a full ISO string
+    if isinstance(last_updated, str) and 'T' in last_updated:
+        try:
+            dt = datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
+            return dt.strftime('%Y-%m-%d')
+        except ValueError:
+            return last_updated[:10]  # Just take the date part
+    return last_updated
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of each word of a normalized string, padded so word starts and ends count"""
+    grams = set()
+    for word in WORD_PATTERN.findall(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class CollectionIndex:
+    """Collections sorted by title with precomputed display values and a search index"""
+
+    def __init__(self, collections: List[Dict[str, Any]]):
+        # Sort collections alphabetically by title
+        ordered = sorted(collections, key=lambda x: x.get('title', x.get('id', '')).lower())
+
+        self.entries: List[Dict[str, Any]] = []
+        self.prefixes: Dict[str, Set[int]] = defaultdict(set)  # Word prefix -> entry positions
+        self.alias_prefixes: Dict[str, Set[int]] = defaultdict(set)
+        self.trigram_index: Dict[str, Set[int]] = defaultdict(set)
+
+        for position, collection in enumerate(ordered):
+            collection_id = collection.get('id', 'Unknown')
+            title = collection.get('title', collection_id)
+            title_text = normalize_text(title)
+            id_text = normalize_text(collection_id)
+            alias_texts = [normalize_text(name) for name in
+                           COUNTRY_ALIASES.get(collection_id.upper(), []) + list(collection.get('keywords') or [])]
+
+            entry = {
+                'id': collection_id,
+                'title': title,
+                'last_updated': format_last_modified(collection.get('last_modified')),
+                'id_text': id_text,
+                'title_text': title_text,
+                'search_text': '\n'.join([title_text, id_text] + alias_texts),
+            }
+            self.entries.append(entry)
+
+            for word in WORD_PATTERN.findall(f"{title_text} {id_text}"):
+                for end in range(1, len(word) + 1):
+                    self.prefixes[word[:end]].add(position)
+            for alias in alias_texts:
+                for word in [alias] + WORD_PATTERN.findall(alias):
+                    for end in range(1, len(word) + 1):
+                        self.alias_prefixes[word[:end]].add(position)
+            for trigram in trigrams(entry['search_text']):
+                self.trigram_index[trigram].add(position)
+
+        self.ids = [entry['id'] for entry in self.entries]
+        self.positions = {collection_id: position for position, collection_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def entry(self, collection_id: str) -> Optional[Dict[str, Any]]:
+        position = self.positions.get(collection_id)
+        return self.entries[position] if position is not None else None
+
+    def rank(self, term: str) -> List[Tuple[int, float]]:
+        """(entry position, score) of matching collections, best match first"""
+        term = normalize_text(term.strip())
+        if not term:
+            return [(position, 0) for position in range(len(self.entries))]
+
+        scores: Dict[int, float] = {}
+
+        def score(positions, value):
+            for position in positions:
+                if scores.get(position, -1) < value:
+                    scores[position] = value
+
+        words = WORD_PATTERN.findall(term)
+        if words:
+            # Every query word must prefix some word of the title or ID (e.g. "sou af")
+            word_matches = set.intersection(*(self.prefixes.get(word, set()) for word in words))
+            score(word_matches, SCORE_WORD_PREFIX)
+            score((p for p in word_matches if self.entries[p]['title_text'].startswith(term)), SCORE_TITLE_PREFIX)
+            score((p for p in word_matches if self.entries[p]['id_text'] == term), SCORE_EXACT_ID)
+        score(self.alias_prefixes.get(term, ()), SCORE_ALIAS_PREFIX)
+
+        # Substring anywhere; only entries containing every inner trigram of the term can match
+        inner = [term[i:i + 3] for i in range(len(term) - 2) if WORD_PATTERN.fullmatch(term[i:i + 3])]
+        if inner:
+            candidates = set.intersection(*(self.trigram_index.get(t, set()) for t in inner))
+        else:
+            candidates = range(len(self.entries))
+        score((p for p in candidates if term in self.entries[p]['search_text']), SCORE_SUBSTRING)
+
+        # Fuzzy: share of the query's trigrams found in the entry, for typos such as "nigria"
+        query_trigrams = trigrams(term)
+        if len(term) >= FUZZY_MIN_LENGTH and query_trigrams:
+            shared: Dict[int, int] = defaultdict(int)
+            for trigram in query_trigrams:
+                for position in self.trigram_index.get(trigram, ()):
+                    shared[position] += 1
+            for position, count in shared.items():
+                similarity = count / len(query_trigrams)
+                if position not in scores and similarity >= FUZZY_THRESHOLD:
+                    scores[position] = SCORE_FUZZY * similarity
+
+        return sorted(scores.items(), key=lambda match: (-match[1], match[0]))
+
+    def search(self, term: str) -> List[str]:
+        """IDs of matching collections, ranked best match first (display order if term is empty)"""
+        return [self.entries[position]['id'] for position, _ in self.rank(term)]
@@ -0,0 +1,153 @@
+"""
+CQL2 Evaluation - answer CQL2-JSON filters locally
+
+evaluate() checks a filter against one STAC item; to_sql() translates it into
+an SQLite WHERE clause when every property it uses is a column. Together they
+let the offline mirror answer the same filters the API gets. Shared by the
+GUI and the CLI, so no tkinter here.
+"""
+import re
+from typing import Dict, List, Any, Optional, Tuple
+
+COMPARISONS = {'=': '=', '<>': '<>', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
+TOP_LEVEL_PROPERTIES = ('id', 'collection')  # Item fields addressed like properties
+
+
+def _is_property(arg: Any) -> bool:
+    return isinstance(arg, dict) and 'property' in arg
+
+
+def item_property(item: Dict[str, Any], name: str) -> Any:
+    """Value of a CQL2 property for an item, None if missing"""
+    if name in TOP_LEVEL_PROPERTIES:
+        return item.get(name)
+    return item.get('properties', {}).get(name)
+
+
+def _value(arg: Any, item: Dict[str, Any]) -> Any:
+    if _is_property(arg):
+        return item_property(item, arg['property'])
+    return arg
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    if left is None or right is None:
+        return False  # Comparisons with a missing value are unknown, i.e. not matched
+    if isinstance(left, str) != isinstance(right, str):
+        # The API coerces e.g. year "2020" = 2020; do the same
+        left, right = str(left), str(right)
+    if op == '=':
+        return left == right
+    if op == '<>':
+        return left != right
+    try:
+        if op == '<':
+            return left < right
+        if op == '<=':
+            return left <= right
+        if op == '>':
+            return left > right
+        return left >= right
+    except TypeError:
+        return False
+
+
+def like_pattern(pattern: str) -> 're.Pattern':
+    """Regular expression for a CQL2 LIKE pattern (% and _ wildcards)"""
+    parts = ['.*' if char == '%' else '.' if char == '_' else re.escape(char) for char in pattern]
+    return re.compile(''.join(parts), re.DOTALL)
+
+
+def glob_pattern(pattern: str) -> str:
+    """SQLite GLOB pattern for a CQL2 LIKE pattern
+
+    CQL2 LIKE is case-sensitive but SQLite's LIKE is not, so the translated
+    filter uses GLOB; its own wildcards are escaped by bracketing them.
+    """
+    special = {'%': '*', '_': '?', '*': '[*]', '?': '[?]', '[': '[[]'}
+    return ''.join(special.get(char, char) for char in pattern)
+
+
+def evaluate(expr: Optional[Dict[str, Any]], item: Dict[str, Any]) -> bool:
+    """Whether an item matches a CQL2-JSON filter (None matches everything)"""
+    if expr is None:
+        return True
+    if isinstance(expr, bool):
+        return expr
+
+    op = expr.get('op')
+    args = expr.get('args', [])
+    if op == 'and':
+        return all(evaluate(arg, item) for arg in args)
+    if op == 'or':
+        return any(evaluate(arg, item) for arg in args)
+    if op == 'not':
+        return not evaluate(args[0], item)
+    if op in COMPARISONS:
+        return _compare(op, _value(args[0], item), _value(args[1], item))
+    if op == 'in':
+        value = _value(args[0], item)
+        return any(_compare('=', value, candidate) for candidate in args[1])
+    if op == 'between':
+        value = _value(args[0], item)
+        return _compare('>=', value, _value(args[1], item)) and _compare('<=', value, _value(args[2], item))
+    if op == 'like':
+        value = _value(args[0], item)
+        return value is not None and like_pattern(args[1]).fullmatch(str(value)) is not None
+    if op == 'isNull':
+        return _value(args[0], item) is None
+    raise ValueError(f"Unsupported CQL2 operator: {op}")
+
+
+def to_sql(expr: Optional[Dict[str, Any]], columns: Dict[str, str]) -> Optional[Tuple[str, List[Any]]]:
+    """(WHERE clause, parameters) for a filter, or None if it uses a property with no column
+
+    Matches evaluate() row for row: a comparison with a missing (NULL) value is
+    false rather than unknown, so negations coalesce NULL to false, and LIKE
+    is case-sensitive.
+    """
+    if expr is None:
+        return '1', []
+
+    def literal(arg, params):
+        if _is_property(arg):
+            column = columns.get(arg['property'])
+            if column is None:
+                raise KeyError(arg['property'])
+            return column
+        params.append(arg)
+        return '?'
+
+    def translate(node, params):
+        if isinstance(node, bool):
+            return '1' if node else '0'
+        op = node.get('op')
+        args = node.get('args', [])
+        if op in ('and', 'or'):
+            if not args:
+                return '1' if op == 'and' else '0'
+            return '(' + f' {op.upper()} '.join(translate(arg, params) for arg in args) + ')'
+        if op == 'not':
+            return f'(NOT COALESCE({translate(args[0], params)}, 0))'
+        if op in COMPARISONS:
+            return f'({literal(args[0], params)} {COMPARISONS[op]} {literal(args[1], params)})'
+        if op == 'in':
+            if not args[1]:
+                return '0'
+            column = literal(args[0], params)
+            placeholders = ', '.join(literal(value, params) for value in args[1])
+            return f'({column} IN ({placeholders}))'
+        if op == 'between':
+            column = literal(args[0], params)
+            return f'({column} BETWEEN {literal(args[1], params)} AND {literal(args[2], params)})'
+        if op == 'like':
+            return f"({literal(args[0], params)} GLOB {literal(glob_pattern(args[1]), params)})"
+        if op == 'isNull':
+            return f'({literal(args[0], params)} IS NULL)'
+        raise ValueError(f"Unsupported CQL2 operator: {op}")
+
+    params: List[Any] = []
+    try:
+        return translate(expr, params), params
+    except KeyError:
+        return None
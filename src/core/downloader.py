@@ -0,0 +1,108 @@
+"""
+Download Operations - plan and run parallel item downloads
+
+Shared by the GUI and the headless CLI, so nothing here may import tkinter or PIL.
+Progress is reported through a callback receiving plain event dicts; callers
+decide whether to marshal them onto the Tk thread or print them as JSON.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from src.core.items import resolve_download_asset, build_local_path
+
+DEFAULT_WORKERS = 4
+
+
+def plan_downloads(items: List[Dict[str, Any]], download_dir: str,
+                   create_subfolders: bool = True,
+                   hydrate: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+                   ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Resolve download URL and local path for each item
+
+    Items may be summaries; if one has no downloadable asset, hydrate(item)
+    is asked for the full item before giving up on it.
+    Returns (tasks, unresolved) where unresolved items have no downloadable asset.
+    """
+    tasks = []
+    unresolved = []
+    for item in items:
+        url, filename = resolve_download_asset(item)
+        if not url and hydrate is not None:
+            url, filename = resolve_download_asset(hydrate(item))
+        if not url:
+            unresolved.append(item)
+            continue
+        tasks.append({
+            'item': item,
+            'url': url,
+            'filename': filename,
+            'path': build_local_path(item, filename, download_dir, create_subfolders),
+        })
+    return tasks, unresolved
+
+
+def download_task(client, task: Dict[str, Any],
+                  emit: Callable[[Dict[str, Any]], None],
+                  cache=None) -> str:
+    """Download a single planned task, emitting 'start', 'progress' and 'done' events
+
+    With a SharedDownloadCache the file is served from the shared cache when
+    possible; the 'done' event's 'source' says whether it came from the cache.
+    """
+    emit({'event': 'start', 'task': task})
+
+    last_percent = [-1]
+
+    def progress_callback(progress, downloaded, total):
+        # The client reports every chunk; only forward whole-percent steps
+        if int(progress) == last_percent[0]:
+            return
+        last_percent[0] = int(progress)
+        emit({'event': 'progress', 'task': task, 'percent': progress,
+              'downloaded': downloaded, 'total': total})
+
+    source = None
+    if cache is not None:
+        try:
+            source = cache.fetch(client, task['url'], task['path'], progress_callback)
+        except OSError as e:
+            print(f"Shared cache unavailable, downloading directly: {e}")
+            cache = None
+    if cache is None and client.download_file(task['url'], task['path'], progress_callback):
+        source = 'network'
+
+    status = 'completed' if source else 'failed'
+    emit({'event': 'done', 'task': task, 'status': status, 'source': source})
+    return status
+
+
+def download_tasks(client, tasks: List[Dict[str, Any]],
+                   workers: int = DEFAULT_WORKERS,
+                   on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+                   stop_event: Optional[threading.Event] = None,
+                   cache=None) -> Dict[str, int]:
+    """Download planned tasks on a thread pool
+
+    Tasks not yet started when stop_event is set are skipped. Returns counts of
+    completed, failed and skipped files.
+    """
+    emit = on_event or (lambda event: None)
+    counts = {'completed': 0, 'failed': 0, 'skipped': 0}
+
+    def run(task):
+        if stop_event is not None and stop_event.is_set():
+            return 'skipped'
+        return download_task(client, task, emit, cache)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(run, task) for task in tasks]
+        for future in as_completed(futures):
+            try:
+                status = future.result()
+            except Exception as e:
+                print(f"Download worker error: {e}")
+                status = 'failed'
+            counts[status] += 1
+
+    return counts
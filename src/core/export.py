@@ -0,0 +1,205 @@
+"""
+Result Export - stream search results to CSV, GeoJSON lines or Parquet
+
+Rows are produced one offset at a time from the ResultStore columns and
+written as they are produced (Parquet in fixed-size row groups), so memory
+stays flat however many results are exported. GeoJSON needs geometry, which
+the store does not keep; pass a hydrate callback to fetch full items.
+Parquet requires the optional pyarrow package (pip install pyarrow).
+Shared by the GUI and the CLI, so no tkinter here.
+"""
+import csv
+import json
+import os
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from src.core.items import resolve_download_asset
+from src.core.result_store import UNKNOWN_TIME
+
+EXPORT_FORMATS = {'csv': '.csv', 'geojsonseq': '.geojsonl', 'parquet': '.parquet'}
+# Exportable columns, in output order, with their Parquet type
+EXPORT_COLUMNS = {
+    'collection': 'string',
+    'id': 'string',
+    'year': 'int32',
+    'resolution': 'string',
+    'project': 'string',
+    'file_type': 'string',
+    'size': 'string',
+    'size_bytes': 'int64',
+    'updated': 'timestamp',
+    'title': 'string',
+    'download_url': 'string',
+}
+DEFAULT_EXPORT_COLUMNS = ['collection', 'id', 'year', 'resolution', 'project', 'file_type',
+                          'size_bytes', 'updated', 'download_url']
+PARQUET_BATCH_ROWS = 10000
+PROGRESS_EVERY = 500  # Rows between progress callbacks
+
+
+class ExportCancelled(Exception):
+    """Raised when the export's cancel check returns True"""
+
+
+def parquet_available() -> bool:
+    """Check whether the optional pyarrow dependency is installed"""
+    return pyarrow is not None
+
+
+def format_for_path(path: str) -> Optional[str]:
+    """Export format implied by a file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.geojsonl', '.geojsons', '.geojsonseq', '.ndjson', '.jsonl'):
+        return 'geojsonseq'
+    for name, default_extension in EXPORT_FORMATS.items():
+        if extension == default_extension:
+            return name
+    return None
+
+
+def export_row(store, offset: int) -> Dict[str, Any]:
+    """Typed values of every EXPORT_COLUMNS field for one store offset"""
+    strings = store.strings
+    timestamp = store.timestamps[offset]
+    size_bytes = store.size_bytes[offset]
+    download_url, _ = resolve_download_asset(store.summary(offset))
+    return {
+        'collection': strings[store.collections[offset]],
+        'id': store.ids[offset],
+        'year': store.years[offset] or None,
+        'resolution': strings[store.resolutions[offset]],
+        'project': strings[store.projects[offset]],
+        'file_type': store.file_type(offset),
+        'size': strings[store.size_texts[offset]],
+        'size_bytes': size_bytes if size_bytes > 0 else None,
+        'updated': datetime.fromtimestamp(timestamp, timezone.utc) if timestamp != UNKNOWN_TIME else None,
+        'title': strings[store.titles[offset]],
+        'download_url': download_url,
+    }
+
+
+def iter_rows(store, offsets: Iterable[int], columns: List[str]) -> Iterator[Dict[str, Any]]:
+    for offset in offsets:
+        row = export_row(store, offset)
+        yield {column: row[column] for column in columns}
+
+
+def _text(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat().replace('+00:00', 'Z')
+    return '' if value is None else value
+
+
+def _write_csv(f, rows: Iterator[Dict[str, Any]], columns: List[str], tick):
+    writer = csv.DictWriter(f, fieldnames=columns)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({column: _text(value) for column, value in row.items()})
+        tick()
+
+
+def _write_geojsonseq(f, store, offsets: Iterable[int], columns: List[str], hydrate, tick):
+    """One GeoJSON Feature per line, with the selected columns as properties"""
+    for offset in offsets:
+        row = export_row(store, offset)
+        item = hydrate(store.summary(offset)) if hydrate else {}
+        feature = {
+            'type': 'Feature',
+            'id': row['id'],
+            'geometry': item.get('geometry'),
+            'bbox': item.get('bbox'),
+            'properties': {column: _text(row[column]) if column == 'updated' else row[column]
+                           for column in columns},
+        }
+        if feature['bbox'] is None:
+            del feature['bbox']
+        f.write(json.dumps(feature) + '\n')
+        tick()
+
+
+def _parquet_schema(columns: List[str]):
+    types = {
+        'string': pyarrow.string(),
+        'int32': pyarrow.int32(),
+        'int64': pyarrow.int64(),
+        'timestamp': pyarrow.timestamp('ms', tz='UTC'),
+    }
+    return pyarrow.schema([(column, types[EXPORT_COLUMNS[column]]) for column in columns])
+
+
+def _write_parquet(path: str, rows: Iterator[Dict[str, Any]], columns: List[str], tick):
+    schema = _parquet_schema(columns)
+    with pyarrow.parquet.ParquetWriter(path, schema, compression='zstd') as writer:
+        batch: Dict[str, List[Any]] = {column: [] for column in columns}
+        count = 0
+        for row in rows:
+            for column in columns:
+                batch[column].append(row[column])
+            count += 1
+            tick()
+            if count == PARQUET_BATCH_ROWS:
+                writer.write_table(pyarrow.table(batch, schema=schema))
+                batch = {column: [] for column in columns}
+                count = 0
+        if count:
+            writer.write_table(pyarrow.table(batch, schema=schema))
+
+
+def write_export(store, offsets: Iterable[int], path: str, fmt: Optional[str] = None,
+                 columns: Optional[List[str]] = None,
+                 hydrate: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                 progress: Optional[Callable[[int], None]] = None,
+                 cancelled: Optional[Callable[[], bool]] = None) -> int:
+    """Write the given store offsets to path and return the number of rows
+
+    fmt defaults to the one implied by the file extension. The file is written
+    under a temporary name and only moved into place once complete.
+    """
+    fmt = fmt or format_for_path(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format for {path}")
+    if fmt == 'parquet' and pyarrow is None:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+    columns = list(DEFAULT_EXPORT_COLUMNS if columns is None else columns)
+    if not columns:
+        raise ValueError("No export columns selected")
+    unknown = [column for column in columns if column not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown export columns: {', '.join(unknown)}")
+
+    count = 0
+
+    def tick():
+        nonlocal count
+        count += 1
+        if count % PROGRESS_EVERY == 0:
+            if cancelled and cancelled():
+                raise ExportCancelled()
+            if progress:
+                progress(count)
+
+    temp_path = f"{path}.part"
+    try:
+        if fmt == 'parquet':
+            _write_parquet(temp_path, iter_rows(store, offsets, columns), columns, tick)
+        else:
+            with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+                if fmt == 'csv':
+                    _write_csv(f, iter_rows(store, offsets, columns), columns, tick)
+                else:
+                    _write_geojsonseq(f, store, offsets, columns, hydrate, tick)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if progress:
+        progress(count)
+    return count
@@ -0,0 +1,73 @@
+"""
+Result Facets - in-memory faceted index over the items of the last search
+
+Narrowing the year, resolution, project or country selection after a search
+is answered from this index instead of a new API request, as long as the
+narrower query is covered by what was fetched. Facet counts for the filter
+checkboxes come from the same postings.
+"""
+from typing import Dict, List, Any, Iterable, Optional, Set
+
+FACETS = ('collection', 'year', 'resolution', 'project', 'file_type')
+
+
+def normalize_selection(selection: Dict[str, Optional[Iterable[Any]]]) -> Dict[str, Optional[Set[str]]]:
+    """Facet -> set of string values; None or an empty selection means unconstrained"""
+    normalized = {}
+    for facet in FACETS:
+        values = selection.get(facet)
+        normalized[facet] = {str(value).replace('Global2_', '') for value in values} if values else None
+    return normalized
+
+
+def covers(fetched: Dict[str, Optional[Set[str]]], requested: Dict[str, Optional[Set[str]]]) -> bool:
+    """Whether every item matching requested is also matched by the fetched query"""
+    for facet in FACETS:
+        if fetched.get(facet) is None:
+            continue
+        if requested.get(facet) is None or not requested[facet] <= fetched[facet]:
+            return False
+    return True
+
+
+class FacetIndex:
+    """Postings of facet value -> ResultStore offsets over one fetched result set"""
+
+    def __init__(self, store):
+        self.size = 0
+        self.postings: Dict[str, Dict[str, Set[int]]] = {facet: {} for facet in FACETS}
+        self.add(store, range(len(store)))
+
+    def add(self, store, offsets: Iterable[int]):
+        """Index newly appended store offsets"""
+        for offset in offsets:
+            for facet in FACETS:
+                self.postings[facet].setdefault(store.facet_value(facet, offset), set()).add(offset)
+            self.size = max(self.size, offset + 1)
+
+    def _matching(self, selection: Dict[str, Optional[Set[str]]], skip: str = None) -> Set[int]:
+        """Positions matching every constrained facet except skip"""
+        matched = None
+        for facet in FACETS:
+            values = selection.get(facet)
+            if facet == skip or values is None:
+                continue
+            positions = set()
+            for value in values:
+                positions |= self.postings[facet].get(value, set())
+            matched = positions if matched is None else matched & positions
+        return set(range(self.size)) if matched is None else matched
+
+    def query(self, selection: Dict[str, Optional[Iterable[Any]]]) -> List[int]:
+        """Store offsets matching the selection, in fetch order"""
+        return sorted(self._matching(normalize_selection(selection)))
+
+    def counts(self, selection: Dict[str, Optional[Iterable[Any]]]) -> Dict[str, Dict[str, int]]:
+        """Facet -> value -> count, each facet counted under the other facets' constraints"""
+        selection = normalize_selection(selection)
+        result = {}
+        for facet in FACETS:
+            base = self._matching(selection, skip=facet)
+            result[facet] = {value: len(positions & base)
+                             for value, positions in self.postings[facet].items()}
+        return result
@@ -0,0 +1,212 @@
+"""
+CQL2 Filter Builder - construct and minimize CQL2-JSON search filters
+
+Small constructors for comparisons, IN lists, ranges and negation, plus an
+optimizer that rewrites OR chains of equalities into IN lists, contiguous
+integer runs (e.g. years) into BETWEEN, and drops clauses that allow every
+available value. The same filters go to the API, the offline mirror and
+cql2.evaluate. Shared by the GUI and the CLI, so no tkinter here.
+"""
+import json
+from typing import Dict, List, Any, Iterable, Optional, Union
+
+from src.config.config import AVAILABLE_PROJECTS, AVAILABLE_RESOLUTIONS, AVAILABLE_YEARS
+
+# Every value the search filters offer per property; selecting all of them is no filter at all
+FILTER_DOMAINS = {
+    'year': AVAILABLE_YEARS,
+    'resolution': AVAILABLE_RESOLUTIONS,
+    'project': AVAILABLE_PROJECTS,
+}
+MIN_RANGE_LENGTH = 3  # Shorter runs of consecutive integers stay in the IN list
+MATCH_NOTHING = {"op": "=", "args": [1, 0]}  # Filter of an unsatisfiable selection
+
+Filter = Union[Dict[str, Any], bool]
+
+
+def prop(name: str) -> Dict[str, str]:
+    return {"property": name}
+
+
+def equals(field: str, value: Any) -> Dict[str, Any]:
+    return {"op": "=", "args": [prop(field), value]}
+
+
+def one_of(field: str, values: Iterable[Any]) -> Dict[str, Any]:
+    """field IN values"""
+    return {"op": "in", "args": [prop(field), list(values)]}
+
+
+def between(field: str, low: Any, high: Any) -> Dict[str, Any]:
+    """low <= field <= high"""
+    return {"op": "between", "args": [prop(field), low, high]}
+
+
+def negate(expr: Dict[str, Any]) -> Dict[str, Any]:
+    return {"op": "not", "args": [expr]}
+
+
+def all_of(*exprs: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """AND of the given clauses, skipping None"""
+    args = [expr for expr in exprs if expr is not None]
+    if not args:
+        return None
+    return args[0] if len(args) == 1 else {"op": "and", "args": args}
+
+
+def any_of(*exprs: Dict[str, Any]) -> Dict[str, Any]:
+    """OR of the given clauses"""
+    return exprs[0] if len(exprs) == 1 else {"op": "or", "args": list(exprs)}
+
+
+def build_or_condition(field: str, values: List[Any]) -> Dict[str, Any]:
+    """Build OR condition for multiple values"""
+    return any_of(*(equals(field, value) for value in values))
+
+
+def matches_nothing(expr: Optional[Filter]) -> bool:
+    """Whether a filter can never match, so the search can be skipped"""
+    return expr is False or expr == MATCH_NOTHING
+
+
+def _is_integer(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _sorted_values(values: Iterable[Any]) -> List[Any]:
+    """Distinct values, integers in numeric order before everything else"""
+    unique = {json.dumps(value, sort_keys=True): value for value in values}
+    return sorted(unique.values(), key=lambda value: (not _is_integer(value),
+                                                      value if _is_integer(value) else 0, str(value)))
+
+
+def _integer_runs(values: List[int]) -> List[List[int]]:
+    """Sorted distinct integers split into runs of consecutive values"""
+    runs = [[values[0]]]
+    for value in values[1:]:
+        if value == runs[-1][-1] + 1:
+            runs[-1].append(value)
+        else:
+            runs.append([value])
+    return runs
+
+
+def _value_set(field: str, values: List[Any]) -> Filter:
+    """Smallest filter for field IN values: =, IN, BETWEEN or an OR of ranges and an IN list"""
+    values = _sorted_values(values)
+    if len(values) == 1:
+        return equals(field, values[0])
+    if not all(_is_integer(value) for value in values):
+        return one_of(field, values)
+
+    clauses, rest = [], []
+    for run in _integer_runs(values):
+        if len(run) >= MIN_RANGE_LENGTH:
+            clauses.append(between(field, run[0], run[-1]))
+        else:
+            rest.extend(run)
+    if rest:
+        clauses.append(equals(field, rest[0]) if len(rest) == 1 else one_of(field, rest))
+    return any_of(*clauses)
+
+
+def _allowed_values(expr: Dict[str, Any]) -> Optional[tuple]:
+    """(field, values) if expr only restricts one property to a list of values"""
+    op = expr.get("op")
+    args = expr.get("args", [])
+    if op == "=" and isinstance(args[0], dict) and "property" in args[0] and not isinstance(args[1], dict):
+        return args[0]["property"], [args[1]]
+    if op == "in" and isinstance(args[0], dict) and "property" in args[0]:
+        return args[0]["property"], list(args[1])
+    return None
+
+
+def _covers_domain(field: str, values: List[Any], domains: Dict[str, List[Any]]) -> bool:
+    domain = domains.get(field)
+    return bool(domain) and set(map(str, domain)) <= set(map(str, values))
+
+
+def optimize(expr: Optional[Filter], domains: Optional[Dict[str, List[Any]]] = None) -> Optional[Filter]:
+    """Equivalent, smaller filter; None if it no longer restricts anything
+
+    domains maps a property to every value it can take (default FILTER_DOMAINS);
+    a clause allowing all of them is dropped. A filter that can never match
+    becomes MATCH_NOTHING rather than False, which callers would read as no filter.
+    """
+    domains = FILTER_DOMAINS if domains is None else domains
+    result = _optimize(expr, domains) if expr is not None else True
+    if result is True:
+        return None
+    if result is False:
+        return dict(MATCH_NOTHING, args=list(MATCH_NOTHING["args"]))
+    return result
+
+
+def _optimize(expr: Filter, domains: Dict[str, List[Any]]) -> Filter:
+    if isinstance(expr, bool) or not isinstance(expr, dict):
+        return expr
+    if matches_nothing(expr):
+        return False
+
+    op = expr.get("op")
+    args = expr.get("args", [])
+
+    if op == "not":
+        inner = _optimize(args[0], domains)
+        if isinstance(inner, bool):
+            return not inner
+        if inner.get("op") == "not":
+            return inner["args"][0]
+        # not(a = b) is not a <> b: an item without the property matches only the former
+        return negate(inner)
+
+    if op in ("and", "or"):
+        absorbing = op == "or"  # True absorbs an OR, False absorbs an AND
+        flat = []
+        for arg in args:
+            arg = _optimize(arg, domains)
+            if arg is absorbing:
+                return absorbing
+            if arg is (not absorbing):
+                continue
+            flat.extend(arg["args"] if arg.get("op") == op else [arg])
+
+        if op == "or":
+            # Merge equalities and IN lists on the same property into one value set
+            merged: Dict[str, List[Any]] = {}
+            others = []
+            for arg in flat:
+                allowed = _allowed_values(arg)
+                if allowed is None:
+                    others.append(arg)
+                else:
+                    merged.setdefault(allowed[0], []).extend(allowed[1])
+            flat = others
+            for field, values in merged.items():
+                if _covers_domain(field, values, domains):
+                    return True
+                value_set = _value_set(field, values)
+                flat.extend(value_set["args"] if value_set.get("op") == "or" else [value_set])
+
+        if not flat:
+            return not absorbing
+        return flat[0] if len(flat) == 1 else {"op": op, "args": flat}
+
+    allowed = _allowed_values(expr)
+    if allowed is not None:
+        if _covers_domain(allowed[0], allowed[1], domains):
+            return True
+        return _value_set(*allowed)
+    return expr
+
+
+def build_search_filter(years: List[int] = None,
+                        resolutions: List[str] = None,
+                        projects: List[str] = None,
+                        domains: Optional[Dict[str, List[Any]]] = None) -> Optional[Dict[str, Any]]:
+    """Build the optimized CQL2 JSON filter, OR-ing values within a field and AND-ing the fields"""
+    return optimize(all_of(
+        build_or_condition("year", years) if years else None,
+        build_or_condition("resolution", resolutions) if resolutions else None,
+        build_or_condition("project", projects) if projects else None,
+    ), domains)
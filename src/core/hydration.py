@@ -0,0 +1,73 @@
+"""
+Item Hydration - fetch full STAC items on demand
+
+Search results only keep summaries (see items.summarize_item). The full item
+with geometry, links and every asset is fetched with get_item when a view
+actually needs it, and the most recently used items are kept in a bounded
+LRU. Shared by the GUI and the CLI, so no tkinter here.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Iterable, Optional, Tuple
+
+from src.core.items import item_key
+
+DEFAULT_CACHE_SIZE = 256
+
+
+class ItemHydrator:
+    """Full-item lookup with a bounded, thread-safe LRU in front of the API
+
+    local_lookup, if given, is tried before the API, e.g. an offline mirror.
+    """
+
+    def __init__(self, client, max_items: int = DEFAULT_CACHE_SIZE,
+                 local_lookup: Optional[Callable[[str, str], Optional[Dict[str, Any]]]] = None):
+        self.client = client
+        self.max_items = max_items
+        self.local_lookup = local_lookup
+        self._items: 'OrderedDict[Tuple[str, str], Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: Dict[str, Any]):
+        """Remember a full item, evicting the least recently used beyond max_items"""
+        with self._lock:
+            key = item_key(item)
+            self._items[key] = item
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def put_many(self, items: Iterable[Dict[str, Any]]):
+        for item in items:
+            self.put(item)
+
+    def cached(self, collection_id: str, item_id: str) -> Optional[Dict[str, Any]]:
+        """Full item if it is in the LRU, without fetching"""
+        with self._lock:
+            item = self._items.get((collection_id, item_id))
+            if item is not None:
+                self._items.move_to_end((collection_id, item_id))
+            return item
+
+    def get(self, collection_id: str, item_id: str) -> Optional[Dict[str, Any]]:
+        """Full item from the LRU, the local lookup or the API (None if unavailable)"""
+        item = self.cached(collection_id, item_id)
+        if item is not None:
+            return item
+
+        if self.local_lookup is not None:
+            item = self.local_lookup(collection_id, item_id)
+        if item is None:
+            item = self.client.get_item(collection_id, item_id)
+        if item is not None:
+            self.put(item)
+        return item
+
+    def hydrate(self, summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Full item for a summary, or the summary itself if it cannot be fetched"""
+        collection_id, item_id = item_key(summary)
+        return self.get(collection_id, item_id) or summary
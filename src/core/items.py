@@ -0,0 +1,150 @@
+"""
+STAC Item Helpers - display info and download asset resolution
+
+Shared by the GUI and the headless CLI, so nothing here may import tkinter or PIL.
+"""
+import os
+from typing import Dict, Any, Optional, Tuple
+
+
+def item_key(item: Dict[str, Any]) -> Tuple[str, str]:
+    """Stable identity of an item across searches: (collection, item id)"""
+    return item.get('collection', ''), item.get('id', '')
+
+
+def is_agesex_item(item: Dict[str, Any]) -> bool:
+    """Check whether an item belongs to the age and sex structures project"""
+    return 'agesex' in item.get('id', '').lower()
+
+
+def get_population_info(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Get information for population data items"""
+    properties = item.get('properties', {})
+    size = properties.get('size')
+    last_updated = properties.get('datetime')
+
+    return {
+        'size': size,
+        'download_type': 'Data File',
+        'last_updated': last_updated
+    }
+
+
+def get_agesex_info(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Get information for age-sex data items"""
+    properties = item.get('properties', {})
+    assets = item.get('assets', {})
+
+    # For age-sex data, prefer archive
+    size = "Unknown"
+    for asset_name, asset in assets.items():
+        if 'arch' in asset_name.lower():
+            size = asset.get('file:size', 'Unknown')
+            break
+
+    # Get last updated date
+    last_updated = properties.get('datetime')
+    return {
+        'size': size,
+        'download_type': 'Archive',
+        'last_updated': last_updated
+    }
+
+
+def get_item_info(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Get display information for any item based on its data type"""
+    if is_agesex_item(item):
+        return get_agesex_info(item)
+    return get_population_info(item)
+
+
+def _filename_from_href(href: str, default: str) -> str:
+    """Extract filename from URL if possible"""
+    if '/' in href:
+        return href.split('/')[-1]
+    return default
+
+
+def _is_archive_asset(asset_name: str, asset: Dict[str, Any]) -> bool:
+    return 'archive' in asset.get('roles', []) or 'arch' in asset_name.lower()
+
+
+def find_download_asset(item: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """Return (asset_name, asset) of the asset that should be downloaded, or (None, None)"""
+    assets = item.get('assets', {})
+
+    # For age-sex data, prefer archive over individual files
+    if is_agesex_item(item):
+        for asset_name, asset in assets.items():
+            if _is_archive_asset(asset_name, asset):
+                if asset.get('href'):
+                    return asset_name, asset
+                break
+
+    # Population data (and age-sex items without an archive) use the first data asset
+    for asset_name, asset in assets.items():
+        if 'data' in asset.get('roles', []):
+            if asset.get('href'):
+                return asset_name, asset
+            break
+
+    return None, None
+
+
+def resolve_download_asset(item: Dict[str, Any]) -> Tuple[Optional[str], str]:
+    """Return (download_url, filename) for the asset that should be downloaded"""
+    item_name = item.get('id', 'unknown')
+    asset_name, asset = find_download_asset(item)
+    if asset is None:
+        return None, f"{item_name}.tif"
+
+    if is_agesex_item(item) and _is_archive_asset(asset_name, asset):
+        default = f"{item_name}_archive.zip"
+    else:
+        default = f"{item_name}.tif"
+    return asset['href'], _filename_from_href(asset['href'], default)
+
+
+SUMMARY_PROPERTIES = ('year', 'resolution', 'project', 'title', 'datetime', 'size')
+
+
+def summarize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Item-shaped summary with only the fields the views and downloads use
+
+    Keeps id, collection, the displayed properties and the download asset, so
+    every helper in this module gives the same answers for the summary as for
+    the full item. Geometry, links and other assets are dropped.
+    """
+    properties = item.get('properties', {})
+    summary = {
+        'id': item.get('id'),
+        'collection': item.get('collection'),
+        'properties': {name: properties[name] for name in SUMMARY_PROPERTIES if name in properties},
+        'assets': {},
+    }
+
+    asset_name, asset = find_download_asset(item)
+    if asset is not None:
+        summary['assets'][asset_name] = {key: asset[key] for key in ('href', 'roles', 'file:size') if key in asset}
+
+    # Age-sex size information comes from the archive asset even if it is not downloadable
+    if is_agesex_item(item):
+        for name, archive in item.get('assets', {}).items():
+            if 'arch' in name.lower():
+                if name not in summary['assets'] and 'file:size' in archive:
+                    summary['assets'][name] = {'file:size': archive['file:size']}
+                break
+    return summary
+
+
+def build_local_path(item: Dict[str, Any], filename: str, download_dir: str,
+                     create_subfolders: bool = True) -> str:
+    """Build the local path for a download, creating country/year folders if requested"""
+    if not create_subfolders:
+        return os.path.join(download_dir, filename)
+
+    country = item.get('collection', 'Unknown')
+    year = str(item.get('properties', {}).get('year', 'Unknown'))
+    subfolder = os.path.join(download_dir, country, year)
+    os.makedirs(subfolder, exist_ok=True)
+    return os.path.join(subfolder, filename)
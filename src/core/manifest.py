@@ -0,0 +1,360 @@
+"""
+Shared Work Manifest - distribute downloads across hosts via a shared filesystem
+
+A manifest directory (e.g. on NFS) holds the planned downloads and one marker
+file per task state:
+
+    manifest.json        planned tasks, written once by 'create'
+    claims/<key>.claim   held by the worker downloading the task; its mtime is
+                         refreshed as a heartbeat
+    done/<key>.done      task finished successfully
+    failed/<key>.failed  attempt count of failed downloads
+
+Claims are taken with O_CREAT | O_EXCL, which is atomic on local filesystems and
+NFSv3+, so no extra services or database locking are needed. SQLite WAL mode was
+deliberately avoided because it relies on shared memory that NFS does not provide.
+Claims whose heartbeat is older than the stale timeout belong to dead workers and
+are recovered by renaming them away, which only one contender can win.
+"""
+import json
+import os
+import random
+import re
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Callable, Optional
+
+from src.core.downloader import plan_downloads, download_task
+from src.core.items import build_local_path
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+DEFAULT_STALE_AFTER = 300  # Seconds without heartbeat before a claim is recovered
+DEFAULT_MAX_ATTEMPTS = 3
+POLL_INTERVAL = 15  # Seconds between rescans while other workers hold claims
+
+
+def task_key(collection: str, item_id: str) -> str:
+    """Filesystem-safe key identifying a task"""
+    return re.sub(r'[^A-Za-z0-9._-]', '_', f"{collection}__{item_id}")
+
+
+def _write_atomic(path: str, data: str):
+    """Write a file via a temporary name so readers never see partial content"""
+    tmp_path = f"{path}.{socket.gethostname()}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def create_manifest(manifest_dir: str, items: List[Dict[str, Any]],
+                    create_subfolders: bool = True) -> Dict[str, Any]:
+    """Write a manifest for the given search results
+
+    Only the fields needed to download and place each file are kept, so a
+    catalog-wide manifest stays small enough for every worker to load.
+    """
+    tasks, unresolved = plan_downloads(items, '', create_subfolders=False)
+    entries = []
+    for task in tasks:
+        item = task['item']
+        properties = item.get('properties', {})
+        entries.append({
+            'key': task_key(item.get('collection', 'Unknown'), item.get('id', 'unknown')),
+            'item': {
+                'id': item.get('id'),
+                'collection': item.get('collection'),
+                'properties': {
+                    'year': properties.get('year'),
+                    'resolution': properties.get('resolution'),
+                    'project': properties.get('project'),
+                },
+            },
+            'url': task['url'],
+            'filename': task['filename'],
+        })
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'created': time.time(),
+        'create_subfolders': create_subfolders,
+        'unresolved': [item.get('id') for item in unresolved],
+        'tasks': entries,
+    }
+
+    for subdir in ('claims', 'done', 'failed'):
+        os.makedirs(os.path.join(manifest_dir, subdir), exist_ok=True)
+    _write_atomic(os.path.join(manifest_dir, MANIFEST_FILE), json.dumps(manifest))
+    return manifest
+
+
+class WorkManifest:
+    """Claim, complete and recover tasks in a shared manifest directory"""
+
+    def __init__(self, manifest_dir: str, stale_after: float = DEFAULT_STALE_AFTER,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.manifest_dir = manifest_dir
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        with open(os.path.join(manifest_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version: {self.manifest.get('version')}")
+        self.tasks = self.manifest['tasks']
+
+        self.claims_dir = os.path.join(manifest_dir, 'claims')
+        self.done_dir = os.path.join(manifest_dir, 'done')
+        self.failed_dir = os.path.join(manifest_dir, 'failed')
+
+        # Claims held by this process, refreshed by the heartbeat thread
+        self.held_claims = set()
+        self.lock = threading.Lock()
+
+    def _claim_path(self, key: str) -> str:
+        return os.path.join(self.claims_dir, f"{key}.claim")
+
+    def _done_path(self, key: str) -> str:
+        return os.path.join(self.done_dir, f"{key}.done")
+
+    def _failed_path(self, key: str) -> str:
+        return os.path.join(self.failed_dir, f"{key}.failed")
+
+    def is_done(self, key: str) -> bool:
+        return os.path.exists(self._done_path(key))
+
+    def attempts(self, key: str) -> int:
+        """Number of failed attempts recorded for a task"""
+        try:
+            with open(self._failed_path(key), encoding='utf-8') as f:
+                return int(json.load(f).get('attempts', 0))
+        except (OSError, ValueError):
+            return 0
+
+    def is_exhausted(self, key: str) -> bool:
+        return self.attempts(key) >= self.max_attempts
+
+    def _claim_age(self, key: str) -> Optional[float]:
+        """Seconds since the claim's last heartbeat, or None if unclaimed"""
+        try:
+            return time.time() - os.stat(self._claim_path(key)).st_mtime
+        except OSError:
+            return None
+
+    def try_claim(self, key: str) -> bool:
+        """Atomically claim a task, recovering it if the current claim is stale"""
+        claim_path = self._claim_path(key)
+        for _ in range(2):
+            try:
+                fd = os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                age = self._claim_age(key)
+                if age is None:
+                    continue  # Released between our attempts; try again
+                if age < self.stale_after:
+                    return False
+                # Stale claim: rename it away; only one contender's rename succeeds
+                stale_path = f"{claim_path}.stale.{socket.gethostname()}.{os.getpid()}.{threading.get_ident()}"
+                try:
+                    os.rename(claim_path, stale_path)
+                    if time.time() - os.stat(stale_path).st_mtime < self.stale_after:
+                        # Lost a race and took a fresh claim; give it back to its owner
+                        try:
+                            os.link(stale_path, claim_path)
+                        except OSError:
+                            pass
+                        os.remove(stale_path)
+                        return False
+                    os.remove(stale_path)
+                except OSError:
+                    return False
+                continue
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'worker': self.worker_id, 'claimed_at': time.time()}, f)
+            # Someone may have finished it between our done check and the claim
+            if self.is_done(key):
+                self.release(key)
+                return False
+            with self.lock:
+                self.held_claims.add(key)
+            return True
+        return False
+
+    def _claim_owner(self, key: str) -> Optional[str]:
+        """Worker id recorded in a claim file, or None if it is missing or unreadable"""
+        try:
+            with open(self._claim_path(key), encoding='utf-8') as f:
+                return json.load(f).get('worker')
+        except (OSError, ValueError):
+            return None
+
+    def release(self, key: str):
+        """Drop a claim held by this process
+
+        If our claim went stale and another worker recovered the task, the
+        claim file now belongs to them and is left alone.
+        """
+        with self.lock:
+            self.held_claims.discard(key)
+        if self._claim_owner(key) != self.worker_id:
+            return
+        try:
+            os.remove(self._claim_path(key))
+        except OSError:
+            pass
+
+    def mark_done(self, key: str):
+        _write_atomic(self._done_path(key), json.dumps({'worker': self.worker_id, 'finished_at': time.time()}))
+        self.release(key)
+
+    def mark_failed(self, key: str):
+        _write_atomic(self._failed_path(key), json.dumps({'worker': self.worker_id,
+                                                          'attempts': self.attempts(key) + 1}))
+        self.release(key)
+
+    def heartbeat(self):
+        """Refresh the mtime of every claim this process holds"""
+        with self.lock:
+            keys = list(self.held_claims)
+        for key in keys:
+            try:
+                os.utime(self._claim_path(key))
+            except OSError:
+                pass
+
+    def status(self) -> Dict[str, int]:
+        """Count tasks by state"""
+        done = set(os.listdir(self.done_dir))
+        counts = {'total': len(self.tasks), 'done': 0, 'claimed': 0, 'stale': 0,
+                  'failed': 0, 'pending': 0}
+        for task in self.tasks:
+            key = task['key']
+            if f"{key}.done" in done:
+                counts['done'] += 1
+                continue
+            age = self._claim_age(key)
+            if age is not None:
+                counts['stale' if age >= self.stale_after else 'claimed'] += 1
+            elif self.is_exhausted(key):
+                counts['failed'] += 1
+            else:
+                counts['pending'] += 1
+        return counts
+
+    def run_worker(self, client, output_dir: str, workers: int = 4,
+                   on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+                   stop_event: Optional[threading.Event] = None,
+                   wait_for_others: bool = True,
+                   cache=None) -> Dict[str, int]:
+        """Claim and download tasks until the manifest is exhausted
+
+        Each worker scans the tasks in its own shuffled order to reduce claim
+        contention between hosts. Threads share one cursor into that order, so
+        a pass visits each task once; tasks known to be done or exhausted are
+        remembered locally and skipped on later passes without touching the
+        shared filesystem. When only tasks claimed by other live workers
+        remain, the worker keeps polling (unless wait_for_others is False) so it
+        can recover them if their owners die.
+        """
+        emit = on_event or (lambda event: None)
+        stop_event = stop_event or threading.Event()
+        counts = {'completed': 0, 'failed': 0}
+        counts_lock = threading.Lock()
+        create_subfolders = self.manifest.get('create_subfolders', True)
+
+        order = list(self.tasks)
+        random.Random(self.worker_id).shuffle(order)
+        settled = set()  # Keys known to be done or exhausted; both are final
+        queue = deque()  # Cursor of the current pass; failed tasks are requeued
+        queue_lock = threading.Lock()
+
+        finished = threading.Event()
+
+        def heartbeat_loop():
+            while not finished.wait(max(1.0, self.stale_after / 5)):
+                self.heartbeat()
+
+        def claim_next() -> Optional[Dict[str, Any]]:
+            while True:
+                with queue_lock:
+                    if not queue:
+                        return None
+                    entry = queue.popleft()
+                key = entry['key']
+                if self.is_done(key) or self.is_exhausted(key):
+                    with queue_lock:
+                        settled.add(key)
+                    continue
+                if self.try_claim(key):
+                    return entry
+
+        def run():
+            while not stop_event.is_set():
+                entry = claim_next()
+                if entry is None:
+                    return
+                key = entry['key']
+                item = entry['item']
+                try:
+                    task = {
+                        'item': item,
+                        'url': entry['url'],
+                        'filename': entry['filename'],
+                        'path': build_local_path(item, entry['filename'], output_dir, create_subfolders),
+                    }
+                    status = download_task(client, task, emit, cache)
+                except Exception as e:
+                    print(f"Manifest worker error on {key}: {e}")
+                    status = 'failed'
+                try:
+                    if status == 'completed':
+                        self.mark_done(key)
+                        with queue_lock:
+                            settled.add(key)
+                    else:
+                        self.mark_failed(key)
+                        with queue_lock:
+                            if self.is_exhausted(key):
+                                settled.add(key)
+                            else:
+                                queue.append(entry)  # Retry later in this pass
+                except OSError as e:
+                    # The outcome could not be recorded; stop the heartbeat so the
+                    # claim goes stale and the task is recovered by a later scan
+                    print(f"Manifest worker could not record {key}: {e}")
+                    with self.lock:
+                        self.held_claims.discard(key)
+                    status = 'failed'
+                with counts_lock:
+                    counts[status] += 1
+
+        heartbeat_thread = threading.Thread(target=heartbeat_loop, daemon=True)
+        heartbeat_thread.start()
+        try:
+            while not stop_event.is_set():
+                with queue_lock:
+                    queue.clear()
+                    queue.extend(entry for entry in order if entry['key'] not in settled)
+                with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                    futures = [executor.submit(run) for _ in range(max(1, workers))]
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                        except Exception as e:
+                            print(f"Manifest worker thread error: {e}")
+
+                status = self.status()
+                outstanding = status['claimed'] + status['stale'] + status['pending']
+                if outstanding == 0 or not wait_for_others:
+                    break
+                emit({'event': 'waiting', 'status': status})
+                stop_event.wait(POLL_INTERVAL)
+        finally:
+            finished.set()
+            heartbeat_thread.join(timeout=1)
+
+        return counts
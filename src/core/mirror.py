@@ -0,0 +1,271 @@
+"""
+Offline Catalog Mirror - local SQLite copy of the collections and item metadata
+
+sync() copies the catalog from the STAC API and afterwards only re-fetches
+collections whose last_modified changed. The mirror answers the same calls
+the search code makes on the API client (get_collections, search_pages,
+search_items, get_item), evaluating the CQL2-JSON filters locally, so it can
+stand in for the client when searching offline. Shared by the GUI and the
+CLI, so no tkinter here.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Any, Optional
+
+from src.core.cancel import CancelToken
+from src.core.cql2 import evaluate, to_sql
+from src.core.spatial import split_antimeridian
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS collections (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    last_modified TEXT,
+    synced_at REAL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    collection TEXT NOT NULL,
+    id TEXT NOT NULL,
+    year INTEGER,
+    resolution TEXT,
+    project TEXT,
+    title TEXT,
+    datetime TEXT,
+    min_x REAL, min_y REAL, max_x REAL, max_y REAL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (collection, id)
+);
+CREATE INDEX IF NOT EXISTS items_year ON items (year);
+CREATE INDEX IF NOT EXISTS items_resolution ON items (resolution);
+CREATE INDEX IF NOT EXISTS items_project ON items (project);
+CREATE INDEX IF NOT EXISTS items_collection_year ON items (collection, year);
+"""
+
+# Earlier mirrors kept a full-text title index that no search used; drop it so syncs skip its triggers
+DROP_FTS = """
+DROP TRIGGER IF EXISTS items_fts_insert;
+DROP TRIGGER IF EXISTS items_fts_delete;
+DROP TRIGGER IF EXISTS items_fts_update;
+DROP TABLE IF EXISTS items_fts;
+"""
+
+# CQL2 properties that are indexed columns; filters on anything else are evaluated in Python
+ITEM_COLUMNS = {
+    'collection': 'collection',
+    'id': 'id',
+    'year': 'year',
+    'resolution': 'resolution',
+    'project': 'project',
+    'title': 'title',
+    'datetime': 'datetime',
+}
+
+SYNC_PAGE_SIZE = 1000
+QUERY_BATCH_SIZE = 500  # Rows read per query while iterating search results
+
+
+class CatalogMirror:
+    """SQLite mirror of the STAC catalog, usable in place of the API client for searches"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Shared by the Tk thread and search threads; every statement runs under the lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.RLock()
+        with self.lock, self.conn:
+            self.conn.executescript(SCHEMA)
+            try:
+                self.conn.executescript(DROP_FTS)
+            except sqlite3.OperationalError as e:
+                print(f"Error dropping the old title index: {e}")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Sync
+
+    def _store_items(self, collection_id: str, items: List[Dict[str, Any]]):
+        rows = []
+        for item in items:
+            properties = item.get('properties', {})
+            bbox = item.get('bbox') or [None] * 4
+            year = properties.get('year')
+            rows.append((
+                item.get('collection', collection_id), item.get('id'),
+                int(year) if str(year).isdigit() else None,
+                properties.get('resolution'), properties.get('project'), properties.get('title'),
+                properties.get('datetime'), *bbox[:4], json.dumps(item),
+            ))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO items (collection, id, year, resolution, project, title, datetime, "
+            "min_x, min_y, max_x, max_y, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def sync(self, client, collection_ids: Optional[List[str]] = None,
+             progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Bring the mirror up to date with the API
+
+        Only collections whose last_modified differs from the mirrored copy are
+        re-fetched. Each collection is replaced in one transaction, so an
+        interrupted sync leaves it at its previous state and the next sync
+        retries it. progress(event, fields) is called per collection.
+        """
+        collections = client.get_collections()
+        if not collections:
+            raise RuntimeError("No collections returned by the API")
+        if collection_ids is not None:
+            wanted = set(collection_ids)
+            collections = [c for c in collections if c.get('id') in wanted]
+
+        with self.lock:
+            known = dict(self.conn.execute("SELECT id, last_modified FROM collections"))
+
+        summary = {'updated': [], 'unchanged': 0, 'removed': [], 'items': 0}
+        for collection in collections:
+            collection_id = collection.get('id')
+            last_modified = collection.get('last_modified')
+            if collection_id in known and last_modified and known[collection_id] == last_modified:
+                summary['unchanged'] += 1
+                continue
+
+            items = []
+            for page in client.search_pages(collections=[collection_id], limit=SYNC_PAGE_SIZE,
+                                            raise_errors=True):
+                items.extend(page.get('features', []))
+
+            with self.lock, self.conn:
+                self.conn.execute("DELETE FROM items WHERE collection = ?", (collection_id,))
+                self._store_items(collection_id, items)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO collections (id, title, last_modified, synced_at, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (collection_id, collection.get('title'), last_modified, time.time(), json.dumps(collection)))
+            summary['updated'].append(collection_id)
+            summary['items'] += len(items)
+            if progress:
+                progress("collection_synced", {'collection': collection_id, 'items': len(items)})
+
+        if collection_ids is None:
+            # Collections that disappeared from the catalog
+            current = {c.get('id') for c in collections}
+            removed = [collection_id for collection_id in known if collection_id not in current]
+            with self.lock, self.conn:
+                for collection_id in removed:
+                    self.conn.execute("DELETE FROM items WHERE collection = ?", (collection_id,))
+                    self.conn.execute("DELETE FROM collections WHERE id = ?", (collection_id,))
+            summary['removed'] = removed
+        return summary
+
+    # Queries, with the same signatures as WorldPopSTACClient
+
+    def get_collections(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.conn.execute("SELECT data FROM collections ORDER BY id").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def get_item(self, collection_id: str, item_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM items WHERE collection = ? AND id = ?",
+                                    (collection_id, item_id)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _query(self, collections: Optional[List[str]], filter_expr: Optional[Dict[str, Any]],
+               bbox: Optional[List[float]], limit: Optional[int] = None,
+               cancel: Optional[CancelToken] = None) -> Iterator[Dict[str, Any]]:
+        """Matching items in (collection, id) order; SQL where possible, Python otherwise
+
+        Rows are read in keyset-paginated batches, each under the lock only
+        while it is fetched, so a broad query never loads the whole mirror and
+        stopping early (limit, cancel, a closed generator) skips the rest.
+        """
+        clauses, params = [], []
+        if collections:
+            clauses.append(f"collection IN ({', '.join('?' * len(collections))})")
+            params.extend(collections)
+        if bbox:
+            # Like spatial.BBoxIndex: a query box crossing the antimeridian is two boxes, and an
+            # item box with min_x > max_x covers [min_x, 180] and [-180, max_x]
+            halves = []
+            for west, south, east, north in split_antimeridian(tuple(bbox[:4])):
+                halves.append("(max_y >= ? AND min_y <= ? AND ((min_x <= max_x AND max_x >= ? AND min_x <= ?) "
+                              "OR (min_x > max_x AND (max_x >= ? OR min_x <= ?))))")
+                params.extend([south, north, west, east, west, east])
+            clauses.append("(" + " OR ".join(halves) + ")")
+
+        translated = to_sql(filter_expr, ITEM_COLUMNS)
+        if translated is not None:
+            clauses.append(translated[0])
+            params.extend(translated[1])
+        where = ' AND '.join(clauses) or '1'
+
+        remaining = limit
+        last_key = None
+        while remaining is None or remaining > 0:
+            if cancel is not None:
+                cancel.check()
+            batch_size = QUERY_BATCH_SIZE
+            if translated is not None and remaining is not None:
+                batch_size = min(batch_size, remaining)  # Every row the SQL returns is a match
+            after, after_params = ("(collection, id) > (?, ?) AND ", list(last_key)) if last_key else ("", [])
+            with self.lock:
+                rows = self.conn.execute(
+                    f"SELECT collection, id, data FROM items WHERE {after}({where}) "
+                    f"ORDER BY collection, id LIMIT ?", after_params + params + [batch_size]).fetchall()
+            for _, _, data in rows:
+                item = json.loads(data)
+                if translated is not None or evaluate(filter_expr, item):
+                    yield item
+                    if remaining is not None:
+                        remaining -= 1
+                        if remaining <= 0:
+                            return
+            if len(rows) < batch_size:
+                return
+            last_key = rows[-1][:2]
+
+    def search_pages(self, collections: List[str] = None,
+                     filter_expr: Dict[str, Any] = None,
+                     filter_lang: str = None,
+                     limit: int = 1000,
+                     bbox: List[float] = None,
+                     raise_errors: bool = False,
+                     cancel: Optional[CancelToken] = None) -> Iterator[Dict[str, Any]]:
+        """Search the mirror page by page, like WorldPopSTACClient.search_pages"""
+        page = []
+        for item in self._query(collections, filter_expr, bbox, cancel=cancel):
+            page.append(item)
+            if len(page) >= limit:
+                if cancel is not None:
+                    cancel.check()
+                yield {'features': page}
+                page = []
+        if page:
+            yield {'features': page}
+
+    def search_items(self, collections: List[str] = None,
+                     filter_expr: Dict[str, Any] = None,
+                     filter_lang: str = None,
+                     limit: int = 100,
+                     bbox: List[float] = None,
+                     raise_errors: bool = False) -> List[Dict[str, Any]]:
+        return list(self._query(collections, filter_expr, bbox, limit=limit))
+
+    def stats(self) -> Dict[str, Any]:
+        """Collection and item counts and the time of the last sync"""
+        with self.lock:
+            collections, last_sync = self.conn.execute(
+                "SELECT COUNT(*), MAX(synced_at) FROM collections").fetchone()
+            items = self.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        return {'collections': collections, 'items': items, 'last_sync': last_sync}
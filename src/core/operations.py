@@ -9,66 +9,63 @@ from tkinter import messagebox, filedialog
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from src.config.config import DOWNLOAD_WORKERS, SHARED_CACHE_MODE
+from src.core.cache import SharedDownloadCache
+from src.core.cancel import CancelToken, OperationCancelled
+from src.core.catalog_snapshot import SyncTracker
+from src.core.cog import CogPipeline, cog_available
+from src.core.collection_index import CollectionIndex
+from src.core.facets import FacetIndex, covers, normalize_selection
+from src.core.downloader import plan_downloads, download_tasks
+from src.core.export import (
+    DEFAULT_EXPORT_COLUMNS, EXPORT_COLUMNS, ExportCancelled, parquet_available, write_export
+)
+from src.core.items import get_agesex_info, get_population_info, item_key
+from src.core.result_store import ResultStore
+from src.core.row_model import selected_values
+from src.core.search import SEARCH_LIMIT, iter_search_pages
+from src.core.spatial import BBoxIndex, parse_bbox
 from src.utils.ui_components import show_notification
 from src.utils.item_details import show_item_details
+from src.utils.export_dialog import show_export_dialog
+
+
+# Delay after the last keystroke before the collection filter runs
+FILTER_DEBOUNCE_MS = 150
+
+# Selection changes larger than this rebuild the selected tree instead of diffing it
+SELECTED_DIFF_LIMIT = 200
 
 
 class AppOperations:
     """Mixin class for application operations"""
 
     def filter_collections(self, event=None):
-        """Filter collections based on search input"""
-        search_term = self.collection_search.get().lower()
+        """Filter collections based on search input, debounced while typing"""
+        if self.filter_after_id is not None:
+            self.root.after_cancel(self.filter_after_id)
+            self.filter_after_id = None
+
+        if event is None:
+            self.apply_collection_filter()
+        else:
+            self.filter_after_id = self.root.after(FILTER_DEBOUNCE_MS, self.apply_collection_filter)
+
+    def apply_collection_filter(self):
+        """Show the matching collection rows in display order, hiding the rest"""
+        self.filter_after_id = None
+        search_term = self.collection_search.get()
 
         # Skip filtering if it's the placeholder text
-        if search_term == "type to search countries...":
+        if search_term.lower() == "type to search countries...":
             return
 
-        # Clear existing items
-        for item in self.collections_tree.get_children():
-            self.collections_tree.delete(item)
-
-        # Filter and display matching collections
-        filtered_collections = []
-        for collection in self.collections:
-            collection_name = collection.get('title', collection.get('id', '')).lower()
-            collection_id = collection.get('id', '').lower()
-
-            # Search in both title and ID
-            if (not search_term or
-                    search_term in collection_name or
-                    search_term in collection_id):
-                filtered_collections.append(collection)
-
-        # Sort filtered collections alphabetically by title
-        sorted_filtered_collections = sorted(filtered_collections,
-                                             key=lambda x: x.get('title', x.get('id', '')).lower())
-
-        # Display filtered collections
-        for collection in sorted_filtered_collections:
-            title = collection.get('title', collection.get('id', 'Unknown'))
-            collection_id = collection.get('id', 'Unknown')
-
-            # Get last updated date
-            last_updated = (collection.get('last_modified') or "Unknown")
-
-            # Format date if it's a full ISO string
-            if isinstance(last_updated, str) and 'T' in last_updated:
-                try:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
-                    last_updated = dt.strftime('%Y-%m-%d')
-                except:
-                    last_updated = last_updated[:10]
-
-            # Insert with collection data stored in tags
-            item_id = self.collections_tree.insert('', 'end', text='☐',
-                                                   values=(title, last_updated, '🔍 Thumbnail', '📋 Metadata'))
-            # Store collection info as a way to retrieve it later
-            self.collections_tree.item(item_id, tags=(collection_id,))
-
-        # Update collection count
-        self.update_stats()
+        self.visible_collection_ids = self.collection_index.search(search_term)
+        self.app_state.set_count('visible_collections', len(self.visible_collection_ids))
+
+        # Rows are detached rather than deleted; set_children reattaches in the given order
+        self.collections_tree.set_children('', *[collection_id for collection_id in self.visible_collection_ids
+                                                 if self.collections_tree.exists(collection_id)])
 
     def toggle_collection_selection(self, event):
         """Toggle selection of collections in tree"""
@@ -77,21 +74,51 @@ class AppOperations:
         if not item:
             return
 
-        # Toggle selection
-        current_text = self.collections_tree.item(item, 'text')
-        if current_text == '☐':
-            self.collections_tree.item(item, text='☑')
-        else:
-            self.collections_tree.item(item, text='☐')
-
-        # Update statistics immediately
-        self.update_stats()
+        # Toggle selection; the state model updates the statistics
+        tags = self.collections_tree.item(item, 'tags')
+        if not tags:
+            return
+        selected = self.app_state.toggle_collection(tags[0])  # First tag is the collection ID
+        self.collections_tree.item(item, text='☑' if selected else '☐')
 
     def select_all_collections(self):
         """Select all available collections"""
-        for item in self.collections_tree.get_children():
-            self.collections_tree.item(item, text='☑')
-        self.update_stats()
+        self.app_state.select_collections(self.visible_collection_ids)
+        for collection_id in self.visible_collection_ids:
+            if self.collections_tree.exists(collection_id):
+                self.collections_tree.item(collection_id, text='☑')
+
+    def current_region(self):
+        """Region bounding box entered in the filter tab, or None if the fields are empty"""
+        values = [var.get().strip() for var in self.region_vars]
+        if not any(values):
+            return None
+        return parse_bbox(values)
+
+    def select_collections_in_region(self):
+        """Tick every collection whose extent intersects the region"""
+        try:
+            bbox = self.current_region()
+        except ValueError as e:
+            show_notification(self.root, str(e), "warning")
+            return
+        if bbox is None:
+            show_notification(self.root, "Enter a region as west, south, east, north", "warning")
+            return
+
+        collection_ids = self.collection_bbox_index.query(bbox)
+        self.app_state.select_collections(collection_ids)
+        for collection_id in collection_ids:
+            if self.collections_tree.exists(collection_id):  # Detached rows too
+                self.collections_tree.item(collection_id, text='☑')
+        show_notification(self.root, f"Selected {len(collection_ids)} collections in region", "success")
+
+    def clear_collection_selection(self):
+        """Untick every collection, including ones hidden by the filter"""
+        self.app_state.clear_collections()
+        for collection_id in self.collection_index.ids:
+            if self.collections_tree.exists(collection_id):  # Detached rows too
+                self.collections_tree.item(collection_id, text='☐')
 
     def select_recent_years(self):
         """Select recent years (2020-2030)"""
@@ -114,15 +141,64 @@ class AppOperations:
             var.set(False)
 
     def export_results(self):
-        """Export search results to CSV"""
-        # Implementation for exporting results
-        pass
+        """Export search results to CSV, GeoJSON lines or Parquet, or cancel the running export"""
+        if self.export_cancel is not None:
+            self.export_cancel.cancel()
+            return
+        if not self.result_offsets and not len(self.selected_items):
+            show_notification(self.root, "No search results to export", "warning")
+            return
+        show_export_dialog(self.root, list(EXPORT_COLUMNS), DEFAULT_EXPORT_COLUMNS,
+                           len(self.selected_items), parquet_available(), self.run_export)
+
+    def run_export(self, path, columns, selected_only, include_geometry):
+        """Write the shown results (in display order) or the selection to path off the Tk thread"""
+        if selected_only:
+            selected = list(self.selected_items)
+            store, offsets, total = None, None, len(selected)
+        else:
+            selected = None
+            store, offsets = self.result_store, list(self.sorted_result_order())
+            total = len(offsets)
+        summary_text = self.results_summary.cget('text')
+        token = CancelToken()
+        self.export_cancel = token
+        self.export_button.config(text="Cancel Export")
+
+        def finish_export():
+            self.export_cancel = None
+            self.export_button.config(text="Export")
+            self.results_summary.config(text=summary_text)
+
+        def show_progress(count):
+            self.root.after(0, lambda: self.results_summary.config(text=f"Exporting {count} of {total} items..."))
+
+        def export():
+            nonlocal store, offsets
+            try:
+                if selected is not None:
+                    # The selection may span several searches, so pack it into its own store
+                    store = ResultStore(selected)
+                    offsets = range(len(store))
+                count = write_export(store, offsets, path, columns=columns,
+                                     hydrate=self.hydrator.hydrate if include_geometry else None,
+                                     progress=show_progress, cancelled=lambda: token.cancelled)
+                self.root.after(0, lambda: show_notification(
+                    self.root, f"Exported {count} items to {os.path.basename(path)}", "success"))
+            except ExportCancelled:
+                self.root.after(0, lambda: show_notification(self.root, "Export cancelled", "info"))
+            except Exception as e:
+                self.root.after(0, lambda: show_notification(self.root, f"Export failed: {e}", "error"))
+            finally:
+                self.root.after(0, finish_export)
+
+        threading.Thread(target=export, daemon=True).start()
 
     def clear_all(self):
         """Clear all selections and results"""
+        self.cancel_search()
         self.clear_selection()
-        self.search_results = []
-        self.update_search_results()
+        self.set_fetched_results(ResultStore(), None, None)
 
     def show_selected_item_details(self):
         """Show details of selected item"""
@@ -134,20 +210,36 @@ class AppOperations:
 
         # Get the first selected item
         tree_item = selection[0]
-        item_index = self.results_tree.index(tree_item)
+        offset = self.results_view.data_index(tree_item)
+
+        if offset is not None:
+            self.show_result_details(offset)
 
-        if item_index < len(self.search_results):
-            selected_item = self.search_results[item_index]
+    def show_result_details(self, offset):
+        """Show the details dialog for a result, fetching the full item if needed"""
+        summary = self.result_store.summary(offset)
+        info = self.result_store.info(offset)
+        collection_id, item_id = self.result_store.key(offset)
 
-            # Get item info
-            item_id = selected_item.get('id', '').lower()
-            if 'agesex' in item_id:
-                info = self.get_agesex_info(selected_item)
-            else:
-                info = self.get_population_info(selected_item)
+        item = self.hydrator.cached(collection_id, item_id)
+        if item is not None:
+            show_item_details(self.root, item, info)
+            return
+
+        self.status_text.config(text=f"Loading {item_id}...")
+
+        def fetch_item():
+            full_item = self.hydrator.get(collection_id, item_id)
+
+            def show():
+                self.status_text.config(text="Ready")
+                if full_item is None:
+                    show_notification(self.root, "Could not load full item; showing summary", "warning")
+                show_item_details(self.root, full_item or summary, info)
 
-            # Show details dialog
-            show_item_details(self.root, selected_item, info)
+            self.root.after(0, show)
+
+        threading.Thread(target=fetch_item, daemon=True).start()
 
     def go_to_downloads(self):
         """Navigate to downloads tab"""
@@ -159,12 +251,33 @@ class AppOperations:
         pass
 
     def load_collections(self):
-        """Load collections from API"""
+        """Show the saved catalog snapshot at once, then refresh it from the API"""
+        showing_snapshot = False
+        if not self.collections and self.catalog_snapshot.collections:
+            self.collections = self.catalog_snapshot.list_collections()
+            self.changed_collection_ids = set(self.catalog_snapshot.changed_since_sync())
+            self.update_collections_display()
+            showing_snapshot = True
 
         def fetch_collections():
             try:
-                self.collections = self.client.get_collections()
-                self.root.after(0, self.update_collections_display)
+                collections = self.client.get_collections()
+                if not collections and self.mirror is not None:
+                    # API unreachable; browse the local mirror and search it offline
+                    self.collections = self.mirror.get_collections()
+                    self.root.after(0, lambda: self.offline_var.set(True))
+                    self.root.after(0, self.update_collections_display)
+                    self.root.after(0, lambda: self.connection_status.config(
+                        text="Offline (local mirror)", style='Warning.TLabel'))
+                    return
+                if not collections and showing_snapshot:
+                    self.root.after(0, lambda: self.connection_status.config(
+                        text="Offline (saved catalog)", style='Warning.TLabel'))
+                    return
+
+                first_refresh = not self.catalog_snapshot.collections
+                diff = self.catalog_snapshot.apply(collections)
+                self.root.after(0, lambda: self.apply_catalog_refresh(collections, diff, first_refresh))
                 self.root.after(0, lambda: self.connection_status.config(
                     text="Connected", style='Success.TLabel'))
             except Exception as e:
@@ -174,175 +287,278 @@ class AppOperations:
 
         threading.Thread(target=fetch_collections, daemon=True).start()
 
+    def apply_catalog_refresh(self, collections, diff, first_refresh=False):
+        """Bring the collections tree up to date with a fresh list, touching only changed rows"""
+        self.collections = collections
+        previously_flagged = self.changed_collection_ids
+        # Flag collections changed since the previous launch or since they were last downloaded
+        self.changed_collection_ids = set(diff['changed']) | set(self.catalog_snapshot.changed_since_sync())
+
+        if diff['added'] or diff['removed'] or not len(self.collection_index) or self.collections_renderer.active:
+            self.update_collections_display()
+        else:
+            if diff['changed']:
+                self.collection_index = CollectionIndex(collections)
+                self.collection_bbox_index = BBoxIndex.from_collections(collections)
+            for collection_id in set(diff['changed']) | previously_flagged | self.changed_collection_ids:
+                self.update_collection_row(collection_id)
+            if diff['changed']:
+                self.apply_collection_filter()  # Titles may have changed, and with them the order
+
+        updated = len(diff['changed']) + len(diff['added'])
+        if updated and not first_refresh:
+            show_notification(self.root, f"Catalog refreshed: {updated} changed or new collections", "info")
+
+    def mark_collections_synced(self, collection_ids):
+        """Clear the changed marker of collections that were just downloaded"""
+        collection_ids = set(collection_ids)
+        self.catalog_snapshot.mark_synced(collection_ids)
+        self.changed_collection_ids -= collection_ids
+        for collection_id in collection_ids:
+            self.update_collection_row(collection_id)
+
     def update_collections_display(self):
         """Update the collections tree display"""
-        # Clear existing items
-        for item in self.collections_tree.get_children():
-            self.collections_tree.delete(item)
-
-        # Sort collections alphabetically by title
-        sorted_collections = sorted(self.collections, key=lambda x: x.get('title', x.get('id', '')).lower())
-
-        # Add collections to tree with available data
-        for collection in sorted_collections:
-            title = collection.get('title', collection.get('id', 'Unknown'))
-            collection_id = collection.get('id', 'Unknown')
-
-            # Get last updated date (same logic as filter_collections)
-            last_updated = (collection.get('last_modified') or
-                            "Unknown")
-
-            # Format date if it's a full ISO string
-            if isinstance(last_updated, str) and 'T' in last_updated:
-                try:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
-                    last_updated = dt.strftime('%Y-%m-%d')
-                except:
-                    last_updated = last_updated[:10]  # Just take the date part
-
-            # Insert with collection data stored in tags
-            item_id = self.collections_tree.insert('', 'end', text='☐',
-                                                   values=(title, last_updated, '🔍 Thumbnail', '📋 Metadata'))
-            # Store collection ID in tags for retrieval
-            self.collections_tree.item(item_id, tags=(collection_id,))
-
-        self.update_stats()
+        self.collection_index = CollectionIndex(self.collections)
+        self.collection_bbox_index = BBoxIndex.from_collections(self.collections)
+        self.collections_tree.delete(*self.collections_tree.get_children())
+
+        # Rows are created once per catalog load, in idle-time batches
+        self.visible_collection_ids = list(self.collection_index.ids)
+        self.app_state.set_count('visible_collections', len(self.visible_collection_ids))
+        self.collections_renderer.start(self.collection_index.entries, self.insert_collection_row,
+                                        on_done=self.apply_collection_filter)
+
+    def collection_row_values(self, entry):
+        """Collections tree columns and tags for an index entry"""
+        collection_id = entry['id']
+        updated = entry['last_updated']
+        # The collection ID is kept as the first tag for retrieval
+        tags = (collection_id,)
+        if collection_id in self.changed_collection_ids:
+            updated = f"● {updated}"  # Changed since the last sync
+            tags = (collection_id, 'changed')
+        return (entry['title'], updated, '🔍 Thumbnail', '📋 Metadata'), tags
+
+    def insert_collection_row(self, entry):
+        """Insert one collection index entry into the collections tree"""
+        collection_id = entry['id']
+
+        # The row ID is the collection ID
+        tick = '☑' if self.app_state.is_collection_selected(collection_id) else '☐'
+        values, tags = self.collection_row_values(entry)
+        self.collections_tree.insert('', 'end', iid=collection_id, text=tick, values=values, tags=tags)
+
+    def update_collection_row(self, collection_id):
+        """Redraw one collection row from the current index"""
+        entry = self.collection_index.entry(collection_id)
+        if entry is not None and self.collections_tree.exists(collection_id):
+            values, tags = self.collection_row_values(entry)
+            self.collections_tree.item(collection_id, values=values, tags=tags)
+
+    def show_render_progress(self, done, total):
+        """Footer hint while a tree is being filled incrementally"""
+        if done < total:
+            self.status_text.config(text=f"Loading rows {done}/{total}...")
+        else:
+            self.status_text.config(text="Ready")
 
     def search_items(self):
         """Enhanced search with progress indication"""
-        # Get selected collections from tree using tags (not indices due to sorting)
-        selected_collections = []
-        for item in self.collections_tree.get_children():
-            if self.collections_tree.item(item, 'text') == '☑':
-                # Get collection ID from tags instead of using index
-                tags = self.collections_tree.item(item, 'tags')
-                if tags and len(tags) > 0:
-                    collection_id = tags[0]  # First tag is the collection ID
-                    selected_collections.append(collection_id)
+        # Get selected collections from the state model
+        selected_collections = sorted(self.app_state.selected_collections)
 
         if not selected_collections:
             show_notification(self.root, "Please select at least one collection", "warning")
             return
 
         # Get selected filter values
-        selected_years = [year for year, var in self.year_vars.items() if var.get()]
-        selected_resolutions = [res for res, var in self.resolution_vars.items() if var.get()]
-        selected_projects = [proj for proj, var in self.project_vars.items() if var.get()]
-
-        self.search_status.config(text="Searching...")
-        self.search_button.config(state="disabled")
-        self.search_progress.start()
-
-        def perform_search():
+        requested = self.current_facet_selection()
+        selected_years = requested['year']
+        selected_resolutions = requested['resolution']
+        selected_projects = requested['project']
+
+        # Items can be limited to the region, not just the collections it intersects
+        bbox = None
+        if self.region_search_var.get():
             try:
-                # Build CQL2 JSON filter for multiple values using OR
-                def build_or_condition(field, values):
-                    """Build OR condition for multiple values"""
-                    if len(values) == 1:
-                        return {"op": "=", "args": [{"property": field}, values[0]]}
-                    else:
-                        conditions = [{"op": "=", "args": [{"property": field}, value]} for value in values]
-                        return {"op": "or", "args": conditions}
+                bbox = self.current_region()
+            except ValueError as e:
+                show_notification(self.root, str(e), "warning")
+                return
 
-                cql_conditions = []
+        # The latest search always wins: stop the one in flight and drop its late pages
+        self.cancel_search()
 
-                # Add conditions for each filter
-                if selected_years:
-                    cql_conditions.append(build_or_condition("year", selected_years))
+        # A narrower query than the last fetch (over the same region) is answered from the facet index
+        if (self.facet_index is not None and self.fetched_bbox == bbox
+                and covers(self.fetched_query, normalize_selection(requested))):
+            self.refine_search_results(requested)
+            return
 
-                if selected_resolutions:
-                    cql_conditions.append(build_or_condition("resolution", selected_resolutions))
+        # The offline mirror answers the same CQL2 filters locally
+        offline = self.mirror is not None and self.offline_var.get()
+        search_client = self.mirror if offline else self.client
 
-                if selected_projects:
-                    cql_conditions.append(build_or_condition("project", selected_projects))
+        generation = self.search_generation
+        token = self.search_cancel = CancelToken()
+        self.search_status.config(text="Searching offline mirror..." if offline else "Searching...")
+        self.search_progress.start()
 
-                # Combine all conditions with AND
-                filter_json = None
-                if cql_conditions:
-                    if len(cql_conditions) == 1:
-                        filter_json = cql_conditions[0]
-                    else:
-                        filter_json = {"op": "and", "args": cql_conditions}
+        def post(callback):
+            self.after_search(generation, callback)
 
+        def perform_search():
+            try:
                 # Update progress
-                self.root.after(0, lambda: self.search_status.config(text="Sending search request..."))
-
-                # Single optimized search request using CQL2 JSON
-                results = self.client.search_items(
-                    collections=selected_collections,
-                    filter_expr=filter_json,
-                    filter_lang="cql2-json" if filter_json else None,
-                    limit=10000  # Increased limit since we're doing one request
+                post(lambda: self.search_status.config(text="Sending search request..."))
+
+                # CQL2 JSON search, streamed page by page; each page is packed into the
+                # columnar store here, off the Tk thread, and shown as soon as it arrives
+                store = ResultStore()
+                pages = iter_search_pages(
+                    search_client, selected_collections,
+                    years=selected_years,
+                    resolutions=selected_resolutions,
+                    projects=selected_projects,
+                    raise_errors=True,
+                    cache=None if offline else self.query_cache,
+                    cancel=token,
+                    bbox=bbox
                 )
-
-                self.search_results = results
-                self.root.after(0, self.update_search_results)
-                self.root.after(0, lambda: show_notification(
-                    self.root, f"Found {len(results)} items", "success"))
-
+                for features, number_matched in pages:
+                    if not len(store):
+                        # Only the first items are kept in full (in the LRU), the rest as summaries
+                        self.hydrator.put_many(features[:self.hydrator.max_items])
+                    offsets = store.append(features)
+                    post(lambda o=offsets, m=number_matched: self.show_result_page(store, o, m))
+
+                count = len(store)
+                facet_index = FacetIndex(store)
+                # A truncated result set cannot answer later refinements
+                fetched_query = normalize_selection(requested) if count < SEARCH_LIMIT else None
+                post(lambda: self.finish_result_pages(store, facet_index, fetched_query, bbox))
+                post(lambda: show_notification(self.root, f"Found {count} items", "success"))
+
+            except OperationCancelled:
+                pass  # Superseded by a newer search, which owns the UI now
             except Exception as e:
-                self.root.after(0, lambda: show_notification(
-                    self.root, f"Search failed: {e}", "error"))
+                post(lambda: show_notification(self.root, f"Search failed: {e}", "error"))
             finally:
-                self.root.after(0, lambda: self.search_button.config(state="normal"))
-                self.root.after(0, lambda: self.search_progress.stop())
-                self.root.after(0, lambda: self.search_status.config(text="Search completed"))
+                post(self.finish_search)
 
         threading.Thread(target=perform_search, daemon=True).start()
 
+    def after_search(self, generation, callback):
+        """Run callback on the Tk thread, unless a newer search has started since generation"""
+        self.root.after(0, lambda: callback() if generation == self.search_generation else None)
+
+    def cancel_search(self):
+        """Abort the search in flight, if any; anything it still posts is dropped"""
+        self.search_generation += 1
+        if self.search_cancel is not None:
+            self.search_cancel.cancel()
+            self.finish_search()
+            self.search_status.config(text="Search cancelled")
+
+    def finish_search(self):
+        """Reset the search progress indicators"""
+        self.search_cancel = None
+        self.search_progress.stop()
+        self.search_progress.config(mode='indeterminate', value=0)
+        self.search_status.config(text="Search completed")
+
+    def set_fetched_results(self, store, facet_index, fetched_query):
+        """Show a freshly fetched result set and keep it for local refinement"""
+        self.result_store = store
+        self.fetched_query = fetched_query
+        self.facet_index = facet_index if fetched_query is not None else None
+        self.set_result_offsets(list(range(len(store))))
+        self.update_facet_counts()
+
+    def show_result_page(self, store, offsets, number_matched):
+        """Append one streamed page of results; sorting and selection work on what has arrived"""
+        if self.result_store is not store:
+            # First page of a new search replaces the previous results
+            self.result_store = store
+            self.fetched_query = None
+            self.facet_index = None
+            self.result_offsets = []
+            self.results_tree.tkraise()  # Show tree
+            self.notebook.select(1)  # Switch to results tab
+
+        self.result_offsets.extend(offsets)
+        count = len(self.result_offsets)
+        self.app_state.set_count('result_count', count)
+        self.results_view.set_rows(self.sorted_result_order(), keep_offset=True)
+
+        if number_matched:
+            # Determinate progress once the server reports the total
+            self.search_progress.stop()
+            self.search_progress.config(mode='determinate', maximum=number_matched, value=count)
+            self.results_summary.config(text=f"Found {count} of {number_matched} so far...")
+        else:
+            self.results_summary.config(text=f"Found {count} so far...")
+        self.search_status.config(text=f"Receiving results: {count}")
+
+    def finish_result_pages(self, store, facet_index, fetched_query, bbox=None):
+        """All pages have arrived: enable local refinement and show the final count"""
+        self.fetched_bbox = bbox
+        if self.result_store is not store:
+            # No page arrived (no results)
+            self.set_fetched_results(store, facet_index, fetched_query)
+            return
+        self.fetched_query = fetched_query
+        self.facet_index = facet_index if fetched_query is not None else None
+        self.results_summary.config(text=f"Found {len(self.result_offsets)} items")
+        self.update_facet_counts()
+
+    def current_facet_selection(self):
+        """Collections and filter values currently ticked, by facet"""
+        return {
+            'collection': sorted(self.app_state.selected_collections),
+            'year': [year for year, var in self.year_vars.items() if var.get()],
+            'resolution': [res for res, var in self.resolution_vars.items() if var.get()],
+            'project': [proj for proj, var in self.project_vars.items() if var.get()],
+        }
+
+    def refine_search_results(self, selection):
+        """Narrow the fetched results locally instead of querying the API again"""
+        offsets = self.facet_index.query(selection)
+        self.set_result_offsets(offsets)
+        self.search_status.config(text=f"Refined locally: {len(offsets)} items")
+        show_notification(self.root, f"Found {len(offsets)} items", "success")
+
+    def update_facet_counts(self):
+        """Show result counts next to the filter checkboxes for the fetched results"""
+        if self.facet_index is None:
+            counts = None
+        else:
+            counts = self.facet_index.counts(self.current_facet_selection())
+
+        for facet, checks in self.facet_checks.items():
+            fetched_values = self.fetched_query.get(facet) if counts is not None else None
+            for value, (checkbutton, text) in checks.items():
+                # Values outside the fetched query have no known count
+                if counts is None or (fetched_values is not None and value not in fetched_values):
+                    checkbutton.config(text=text)
+                else:
+                    checkbutton.config(text=f"{text} ({counts[facet].get(value, 0)})")
+
+    def set_result_offsets(self, offsets):
+        """Show the given result_store offsets (all fetched results or a local refinement)"""
+        self.result_offsets = offsets
+        self.app_state.set_count('result_count', len(offsets))
+        self.update_search_results()
+
     def update_search_results(self):
         """Update search results display"""
-        # Clear existing results
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-
         # Update summary
-        count = len(self.search_results)
+        count = len(self.result_offsets)
         self.results_summary.config(text=f"Found {count} items")
 
-        # Populate tree with enhanced information
-        for item in self.search_results:
-            properties = item.get('properties', {})
-            item_id = item.get('id', '').lower()
-
-            # Get file size and date using specialized functions
-            if 'agesex' in item_id:
-                info = self.get_agesex_info(item)
-            else:
-                info = self.get_population_info(item)
-
-            file_size = info['size']
-            last_updated = info['last_updated']
-
-            # Format date nicely if available
-            if last_updated != 'Unknown':
-                try:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
-                    last_updated = dt.strftime('%Y-%m-%d')
-                except:
-                    pass
-
-            # Determine file type based on download type
-            file_type = "ZIP" if info['download_type'] == 'Archive' else "TIF"
-
-            values = (
-                item.get('collection', 'Unknown'),
-                item.get('id', 'Unknown'),
-                properties.get('year', 'Unknown'),
-                properties.get('resolution', 'Unknown'),
-                properties.get('project', 'Unknown').replace('Global2_', ''),
-                file_type,
-                file_size,
-                last_updated,
-                '📋 Details'  # Add Details button column
-            )
-
-            self.results_tree.insert('', 'end', text='☐', values=values, tags=('unselected',))
-
-        # Update statistics
-        self.update_stats()
+        # Only the visible window of rows is rendered; see render_result_row
+        self.results_view.set_rows(self.sorted_result_order())
 
         # Show/hide placeholder based on results count
         if count > 0:
@@ -351,6 +567,19 @@ class AppOperations:
         else:
             self.results_placeholder.tkraise()  # Show placeholder
 
+    def sorted_result_order(self):
+        """Display order of result_offsets under the current column sort"""
+        if not self.sort_spec:
+            return self.result_offsets
+        return self.result_store.order(self.result_offsets, self.sort_spec)
+
+    def render_result_row(self, offset):
+        """Return (text, values, tags) of the results row for a result_store offset"""
+        values = self.result_store.values(offset)
+        if self.selected_items.contains_key(self.result_store.key(offset)):
+            return '☑', values, ('selected',)
+        return '☐', values, ('unselected',)
+
     def toggle_item_selection(self, event):
         """Toggle item selection in results"""
         # Get the item that was clicked
@@ -358,45 +587,30 @@ class AppOperations:
         if not item:
             return
 
-        # Get item index to find in search_results
-        item_index = self.results_tree.index(item)
-        if item_index >= len(self.search_results):
+        # Map the recycled tree row back to its result_store offset
+        offset = self.results_view.data_index(item)
+        if offset is None:
             return
 
-        # Toggle selection
-        current_text = self.results_tree.item(item, 'text')
-        result_item = self.search_results[item_index]
-
-        if current_text == '☐':
-            # Select item
-            self.results_tree.item(item, text='☑', tags=('selected',))
-            if result_item not in self.selected_items:
-                self.selected_items.append(result_item)
-        else:
-            # Deselect item
-            self.results_tree.item(item, text='☐', tags=('unselected',))
-            if result_item in self.selected_items:
-                self.selected_items.remove(result_item)
-
-        # Update selected tree and statistics
-        self.update_selected_tree()
-        self.update_stats()
+        # Toggle selection of the item summary; on_selection_changed refreshes the views
+        self.selected_items.toggle(self.result_store.summary(offset))
 
     def select_all_results(self):
         """Select all search results"""
-        self.selected_items = self.search_results.copy()
-        for item in self.results_tree.get_children():
-            self.results_tree.item(item, text='☑', tags=('selected',))
-        self.update_selected_tree()
-        self.update_stats()
+        self.selected_items.replace(self.result_store.summary(offset) for offset in self.result_offsets)
 
     def clear_selection(self):
         """Clear all selected items"""
         self.selected_items.clear()
-        for item in self.results_tree.get_children():
-            self.results_tree.item(item, text='☐')
-        self.update_selected_tree()
-        self.update_stats()
+
+    def on_selection_changed(self, added, removed):
+        """Selection listener: update visible rows, selected tree and statistics"""
+        self.results_view.refresh()
+        if len(added) + len(removed) > SELECTED_DIFF_LIMIT:
+            self.update_selected_tree()  # Bulk change: one rebuild beats many single edits
+        else:
+            self.apply_selected_tree_diff(added, removed)
+        self.app_state.set_count('selected_item_count', len(self.selected_items))
 
     def select_download_dir(self):
         """Select download directory"""
@@ -404,6 +618,12 @@ class AppOperations:
         if directory:
             self.download_dir.set(directory)
 
+    def select_cache_dir(self):
+        """Select shared download cache directory"""
+        directory = filedialog.askdirectory(initialdir=self.cache_dir.get() or self.download_dir.get())
+        if directory:
+            self.cache_dir.set(directory)
+
     def start_download(self):
         """Start downloading selected items with enhanced progress tracking"""
         if not self.selected_items:
@@ -417,8 +637,21 @@ class AppOperations:
                 show_notification(self.root, f"Cannot create download directory: {e}", "error")
                 return
 
+        cache = None
+        if self.cache_dir.get():
+            try:
+                cache = SharedDownloadCache(self.cache_dir.get(), SHARED_CACHE_MODE)
+            except OSError as e:
+                show_notification(self.root, f"Shared cache unavailable, downloading directly: {e}", "warning")
+
+        convert_cog = self.convert_cog.get()
+        if convert_cog and not cog_available():
+            show_notification(self.root, "COG conversion requires rasterio (pip install rasterio)", "warning")
+            convert_cog = False
+
         # Update UI state for active download
         self.download_active.set(True)
+        self.download_stop_event = threading.Event()
         self.download_button.config(state="disabled")
         self.stop_button.config(state="normal")
         self.progress_var.set(0)
@@ -428,116 +661,89 @@ class AppOperations:
         self.bytes_downloaded = 0
         self.total_bytes = 0
 
-        def download_files():
-            total_files = len(self.selected_items)
-            downloaded_files = 0
-            failed_files = 0
-
-            for i, item in enumerate(self.selected_items):
-                # Check if download was stopped
-                if not self.download_active.get():
-                    break
-
-                # Get download URL from appropriate asset
-                assets = item.get('assets', {})
-                download_url = None
-                filename = f"{item.get('id', 'unknown')}.tif"
-                item_id = item.get('id', '').lower()
-
-                # For age-sex data, prefer archive over individual files
-                if 'agesex' in item_id:
-                    # Look for archive asset first
-                    for asset_name, asset in assets.items():
-                        if 'archive' in asset.get('roles', []) or 'arch' in asset_name.lower():
-                            download_url = asset.get('href')
-                            if download_url:
-                                # Extract filename from URL if possible
-                                if '/' in download_url:
-                                    filename = download_url.split('/')[-1]
-                                else:
-                                    filename = f"{item.get('id', 'unknown')}_archive.zip"
-                            break
-
-                    # If no archive found, fall back to first data asset
-                    if not download_url:
-                        for asset_name, asset in assets.items():
-                            if 'data' in asset.get('roles', []):
-                                download_url = asset.get('href')
-                                if download_url:
-                                    if '/' in download_url:
-                                        filename = download_url.split('/')[-1]
-                                break
-                else:
-                    # For population data, use standard data asset
-                    for asset_name, asset in assets.items():
-                        if 'data' in asset.get('roles', []):
-                            download_url = asset.get('href')
-                            if download_url:
-                                # Extract filename from URL if possible
-                                if '/' in download_url:
-                                    filename = download_url.split('/')[-1]
-                            break
-
-                if not download_url:
-                    failed_files += 1
-                    continue
-
-                # Create folder structure if requested
-                if self.create_subfolders.get():
-                    # Extract country and year from item data
-                    country = item.get('collection', 'Unknown')
-                    properties = item.get('properties', {})
-                    year = str(properties.get('year', 'Unknown'))
-
-                    # Create country/year folder structure
-                    subfolder = os.path.join(self.download_dir.get(), country, year)
-                    os.makedirs(subfolder, exist_ok=True)
-                    local_path = os.path.join(subfolder, filename)
-                else:
-                    local_path = os.path.join(self.download_dir.get(), filename)
-
-                # Update progress with current file
-                progress = (i / total_files) * 100
-                current_time = datetime.now()
-                elapsed = (current_time - self.download_start_time).total_seconds()
-
-                def update_ui():
-                    self.progress_var.set(progress)
-                    self.progress_label.config(text=f"Downloading {filename}")
-
-                    stats_text = f"Files: {downloaded_files}/{total_files}"
-                    if failed_files > 0:
-                        stats_text += f" (Failed: {failed_files})"
-                    self.download_stats.config(text=stats_text)
+        items = list(self.selected_items)
+        download_dir = self.download_dir.get()
+        create_subfolders = self.create_subfolders.get()
+        stop_event = self.download_stop_event
 
-                    # Clear speed display
-                    self.speed_label.config(text="")
+        def download_files():
+            total_files = len(items)
+            tasks, unresolved = plan_downloads(items, download_dir, create_subfolders,
+                                               hydrate=self.hydrator.hydrate)
+            state = {'downloaded': 0, 'failed': len(unresolved)}
+            state_lock = threading.Lock()
+            sync_tracker = SyncTracker(tasks, unresolved)
+
+            path_keys = {task['path']: item_key(task['item']) for task in tasks}
+
+            # Update selected tree status for an item (constant-time row lookup)
+            def update_tree_status(key, status):
+                row = self.selected_rows.get(key)
+                if row and self.selected_tree.exists(row):
+                    self.selected_tree.set(row, 'Status', status)
+
+            for item in unresolved:
+                self.root.after(0, lambda key=item_key(item): update_tree_status(key, "❌ No download"))
+
+            def update_ui(filename):
+                finished = state['downloaded'] + state['failed']
+                self.progress_var.set((finished / total_files) * 100)
+                self.progress_label.config(text=f"Downloading {filename}")
+
+                stats_text = f"Files: {state['downloaded']}/{total_files}"
+                if state['failed'] > 0:
+                    stats_text += f" (Failed: {state['failed']})"
+                self.download_stats.config(text=stats_text)
 
-                self.root.after(0, update_ui)
+                # Clear speed display
+                self.speed_label.config(text="")
 
-                # Update selected tree status for current file
-                def update_tree_status(status):
-                    for tree_item in self.selected_tree.get_children():
-                        values = self.selected_tree.item(tree_item, 'values')
-                        if filename in values[0]:  # Match by filename in item name
-                            self.selected_tree.item(tree_item, values=(values[0], values[1], status))
-                            break
+            def on_cog_result(result):
+                key = path_keys.get(result['path'])
+                status = "✅ Complete" if result['status'] == 'completed' else "⚠ Not optimized"
+                self.root.after(0, lambda: update_tree_status(key, status))
+
+            cog_pipeline = CogPipeline(on_result=on_cog_result) if convert_cog else None
+
+            def on_event(event):
+                filename = event['task']['filename']
+                key = item_key(event['task']['item'])
+                if event['event'] == 'start':
+                    self.root.after(0, lambda: update_ui(filename))
+                    self.root.after(0, lambda: update_tree_status(key, "Downloading..."))
+                elif event['event'] == 'progress':
+                    status = f"Downloading {int(event['percent'])}%"
+                    self.root.after(0, lambda: update_tree_status(key, status))
+                elif event['event'] == 'done':
+                    sync_tracker.record(event)
+                    with state_lock:
+                        state['downloaded' if event['status'] == 'completed' else 'failed'] += 1
+                    if event['status'] == 'completed':
+                        status = "✅ Cached" if event.get('source') == 'cache' else "✅ Complete"
+                        if cog_pipeline is not None and cog_pipeline.submit(event['task']['path']):
+                            status = "⚙ Optimizing..."
+                        self.root.after(0, lambda: update_tree_status(key, status))
+                    else:
+                        self.root.after(0, lambda: update_tree_status(key, "❌ Failed"))
 
-                self.root.after(0, lambda: update_tree_status("Downloading..."))
+            download_tasks(self.client, tasks, workers=DOWNLOAD_WORKERS,
+                           on_event=on_event, stop_event=stop_event, cache=cache)
+            downloaded_files = state['downloaded']
+            failed_files = state['failed']
 
-                # Download file
-                success = self.client.download_file(download_url, local_path)
+            cog_counts = None
+            if cog_pipeline is not None:
+                self.root.after(0, lambda: self.progress_label.config(
+                    text=f"Optimizing {len(cog_pipeline.futures)} GeoTIFFs..."))
+                cog_counts = cog_pipeline.wait()
 
-                if success:
-                    downloaded_files += 1
-                    self.root.after(0, lambda: update_tree_status("✅ Complete"))
-                else:
-                    failed_files += 1
-                    self.root.after(0, lambda: update_tree_status("❌ Failed"))
+            synced_collections = sync_tracker.synced()
 
             # Download completed or stopped
             def finalize_download():
                 self.download_active.set(False)
+                if synced_collections:
+                    self.mark_collections_synced(synced_collections)
                 self.download_button.config(state="normal")
                 self.stop_button.config(state="disabled")
                 self.progress_var.set(
@@ -558,6 +764,10 @@ class AppOperations:
                 stats_text = f"Completed: {downloaded_files}/{total_files}"
                 if failed_files > 0:
                     stats_text += f" | Failed: {failed_files}"
+                if cog_counts is not None:
+                    stats_text += f" | COG: {cog_counts['completed']}"
+                    if cog_counts['failed'] > 0:
+                        stats_text += f" (Failed: {cog_counts['failed']})"
                 stats_text += f" | Time: {int(elapsed // 60)}m {int(elapsed % 60)}s"
                 self.download_stats.config(text=stats_text)
                 self.speed_label.config(text="")
@@ -573,64 +783,49 @@ class AppOperations:
 
     def get_population_info(self, item):
         """Get information for population data items"""
-        properties = item.get('properties', {})
-        size = properties.get('size')
-        last_updated = properties.get('datetime')
-
-        return {
-            'size': size,
-            'download_type': 'Data File',
-            'last_updated': last_updated
-        }
+        return get_population_info(item)
 
     def get_agesex_info(self, item):
         """Get information for age-sex data items"""
-        properties = item.get('properties', {})
-        assets = item.get('assets', {})
-
-        # For age-sex data, prefer archive
-        size = "Unknown"
-        for asset_name, asset in assets.items():
-            if 'arch' in asset_name.lower():
-                size = asset.get('file:size', 'Unknown')
-                break
-
-        # Get last updated date
-        last_updated = properties.get('datetime')
-        return {
-            'size': size,
-            'download_type': 'Archive',
-            'last_updated': last_updated
-        }
+        return get_agesex_info(item)
 
     def update_selected_tree(self):
         """Update selected items tree in download tab"""
         # Clear existing items
-
-        for item in self.selected_tree.get_children():
-            self.selected_tree.delete(item)
+        self.selected_tree.delete(*self.selected_tree.get_children())
+        self.selected_rows = {}
 
         # Show/hide placeholder based on selected items
         if not self.selected_items:
+            self.selected_renderer.cancel()
             self.selected_placeholder.tkraise()
         else:
             self.selected_tree.tkraise()
 
-            # Add selected items
-            for item in self.selected_items:
-                properties = item.get('properties', {})
-                item_id = item.get('id', '').lower()
+            # Add selected items in idle-time batches
+            self.selected_renderer.start(self.selected_items, self.insert_selected_row)
 
-                # Get information based on data type
-                if 'agesex' in item_id:
-                    info = self.get_agesex_info(item)
-                else:
-                    info = self.get_population_info(item)
+    def apply_selected_tree_diff(self, added, removed):
+        """Add and remove individual rows of the selected items tree"""
+        for item in removed:
+            row = self.selected_rows.pop(item_key(item), None)
+            if row is not None and self.selected_tree.exists(row):
+                self.selected_tree.delete(row)
+        for item in added:
+            self.insert_selected_row(item)
 
-                item_name = item.get('id')
-                item_title = properties.get('title')
-                collection = item.get('collection')
-                file_type = "ZIP" if info['download_type'] == 'Archive' else "TIF"
+        # Show/hide placeholder based on selected items
+        if self.selected_items:
+            self.selected_tree.tkraise()
+        else:
+            self.selected_placeholder.tkraise()
+
+    def insert_selected_row(self, item):
+        """Insert one selected item into the download tab tree"""
+        # An incremental rebuild may reach items that were toggled meanwhile
+        key = item_key(item)
+        if key in self.selected_rows or not self.selected_items.contains_key(key):
+            return
 
-                self.selected_tree.insert('', 'end',
-                                          values=(item_title, collection, item_name, file_type, info['size'], "Ready"))
+        tree_row = self.selected_tree.insert('', 'end', values=selected_values(item) + ("Ready",))
+        self.selected_rows[key] = tree_row
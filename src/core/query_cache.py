@@ -0,0 +1,260 @@
+"""
+Query Result Cache - recently fetched search results keyed by the query
+
+The key is a hash of the API endpoint, the canonical CQL2 filter (AND/OR
+arguments sorted, so the order boxes were ticked in does not matter), the
+sorted collection list, the bounding box and the result limit. Results are
+kept zlib-compressed as JSON lines in a bounded in-memory LRU and, optionally,
+in a directory on disk, so going back to an earlier search does not hit the
+API again. Entries expire after a TTL.
+Shared by the GUI and the CLI, so no tkinter here.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+DEFAULT_TTL = 3600  # Seconds a cached result set stays valid
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024  # Compressed bytes kept in memory
+DEFAULT_DISK_BYTES = 512 * 1024 * 1024  # Compressed bytes kept in the cache directory
+
+
+def canonical_filter(expr: Any) -> Any:
+    """CQL2 JSON with commutative and/or arguments flattened and sorted"""
+    if isinstance(expr, list):
+        return [canonical_filter(value) for value in expr]
+    if not isinstance(expr, dict):
+        return expr
+
+    canonical = {key: canonical_filter(value) for key, value in expr.items()}
+    op = canonical.get('op')
+    if op in ('and', 'or'):
+        args = []
+        for arg in canonical.get('args', []):
+            # (a or (b or c)) is (a or b or c)
+            if isinstance(arg, dict) and arg.get('op') == op:
+                args.extend(arg.get('args', []))
+            else:
+                args.append(arg)
+        unique = {json.dumps(arg, sort_keys=True): arg for arg in args}
+        args = [unique[text] for text in sorted(unique)]
+        if len(args) == 1:
+            return args[0]
+        canonical['args'] = args
+    return canonical
+
+
+def query_key(collections: Iterable[str], filter_expr: Optional[Dict[str, Any]], limit: int,
+              bbox: Optional[Iterable[float]] = None, endpoint: Optional[str] = None) -> str:
+    """Cache key of a search, independent of collection and filter argument order
+
+    endpoint is the API base URL, so catalogs behind different URLs never
+    share cached results.
+    """
+    query = {
+        'endpoint': endpoint.rstrip('/') if endpoint else None,
+        'collections': sorted(set(collections)),
+        'filter': canonical_filter(filter_expr),
+        'limit': limit,
+    }
+    if bbox:
+        query['bbox'] = [float(value) for value in bbox]
+    return hashlib.sha256(json.dumps(query, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class QueryCacheWriter:
+    """Compresses one result set as its pages arrive; nothing is cached until commit"""
+
+    def __init__(self, cache: 'QueryCache', key: str):
+        self.cache = cache
+        self.key = key
+        self._compressor = zlib.compressobj()
+        self._chunks: List[bytes] = []
+        self.count = 0
+
+    def add(self, features: Iterable[Dict[str, Any]]):
+        for feature in features:
+            self._chunks.append(self._compressor.compress(json.dumps(feature).encode('utf-8') + b'\n'))
+            self.count += 1
+
+    def commit(self, number_matched: Optional[int] = None):
+        """Store the complete result set"""
+        self._chunks.append(self._compressor.flush())
+        self.cache.put_blob(self.key, b''.join(self._chunks), self.count, number_matched)
+        self._chunks = []
+
+
+class QueryCache:
+    """Bounded LRU of compressed result sets with a TTL and an optional disk tier"""
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 max_memory_bytes: int = DEFAULT_MEMORY_BYTES,
+                 max_disk_bytes: int = DEFAULT_DISK_BYTES):
+        self.cache_dir = cache_dir or None
+        self.ttl = ttl
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        # key -> {'created', 'count', 'number_matched', 'blob'}
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    # Memory tier
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old['blob'])
+            if len(entry['blob']) > self.max_memory_bytes:
+                return  # Too large for memory; the disk tier may still have it
+            self._entries[key] = entry
+            self._memory_bytes += len(entry['blob'])
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_bytes -= len(evicted['blob'])
+
+    def _recall(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry['created']):
+                del self._entries[key]
+                self._memory_bytes -= len(entry['blob'])
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    # Disk tier
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return f"{base}.jsonl.z", f"{base}.json"
+
+    def _write_disk(self, key: str, entry: Dict[str, Any]):
+        blob_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        suffix = f".tmp.{os.getpid()}.{threading.get_ident()}"
+        with open(blob_path + suffix, 'wb') as f:
+            f.write(entry['blob'])
+        os.replace(blob_path + suffix, blob_path)
+        # The metadata file is written last and marks the entry complete
+        metadata = {name: entry[name] for name in ('created', 'count', 'number_matched')}
+        with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+        os.replace(meta_path + suffix, meta_path)
+        self._trim_disk()
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        blob_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if self._expired(entry['created']):
+                self._remove_disk(key)
+                return None
+            with open(blob_path, 'rb') as f:
+                entry['blob'] = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry
+
+    def _remove_disk(self, key: str):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _trim_disk(self):
+        """Drop expired entries, then the oldest ones until under max_disk_bytes"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                key = name[:-len('.json')]
+                try:
+                    with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                        created = json.load(f)['created']
+                    size = os.path.getsize(self._paths(key)[0])
+                except (OSError, ValueError, KeyError):
+                    continue
+                if self._expired(created):
+                    self._remove_disk(key)
+                else:
+                    entries.append((created, key, size))
+
+        total = sum(size for _, _, size in entries)
+        for _, key, size in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            self._remove_disk(key)
+            total -= size
+
+    # Public interface
+
+    def writer(self, key: str) -> QueryCacheWriter:
+        return QueryCacheWriter(self, key)
+
+    def put(self, key: str, features: Iterable[Dict[str, Any]], number_matched: Optional[int] = None):
+        writer = self.writer(key)
+        writer.add(features)
+        writer.commit(number_matched)
+
+    def put_blob(self, key: str, blob: bytes, count: int, number_matched: Optional[int] = None):
+        """Store an already compressed result set (see QueryCacheWriter)"""
+        entry = {'created': time.time(), 'count': count, 'number_matched': number_matched, 'blob': blob}
+        self._remember(key, entry)
+        if self.cache_dir:
+            try:
+                self._write_disk(key, entry)
+            except OSError as e:
+                print(f"Error writing query cache: {e}")
+
+    def get(self, key: str) -> Optional[Tuple[List[Dict[str, Any]], Optional[int]]]:
+        """(features, number_matched) of a cached search, or None on a miss"""
+        entry = self._recall(key)
+        if entry is None and self.cache_dir:
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None:
+            return None
+
+        lines = zlib.decompress(entry['blob']).splitlines()
+        return [json.loads(line) for line in lines], entry['number_matched']
+
+    def invalidate(self, key: Optional[str] = None):
+        """Forget one cached search, or all of them"""
+        with self._lock:
+            keys = [key] if key is not None else list(self._entries)
+            for name in keys:
+                entry = self._entries.pop(name, None)
+                if entry is not None:
+                    self._memory_bytes -= len(entry['blob'])
+        if self.cache_dir:
+            if key is not None:
+                self._remove_disk(key)
+            else:
+                for root, _, files in os.walk(self.cache_dir):
+                    for name in files:
+                        if name.endswith('.json'):
+                            self._remove_disk(name[:-len('.json')])
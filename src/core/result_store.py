@@ -0,0 +1,216 @@
+"""
+Result Store - compact columnar container for search results
+
+Search results are kept as typed arrays (year, resolution, size, timestamp),
+codes into one interned string table (collection, project, titles, dates)
+and an (collection, id) -> offset index instead of one nested STAC dict per
+item. Only a summary of each item is kept; views that need the full item
+(e.g. the details dialog) fetch it through an ItemHydrator. Columns hold the
+raw values, so summaries rebuild the item faithfully for download paths and
+exports; 'Unknown' and project name cleanup are applied only for display.
+Shared by the GUI and the CLI, so no tkinter here.
+"""
+import threading
+from array import array
+from typing import Dict, List, Any, Iterable, Optional, Sequence, Tuple
+
+from src.core.items import get_item_info, is_agesex_item, item_key, summarize_item
+from src.core.row_model import SORT_COLUMNS, parse_datetime, parse_size_bytes, resolution_metres
+
+UNKNOWN_TIME = float('-inf')
+_MISSING = object()  # Year property absent from the item
+
+
+def display_text(value: Any) -> Any:
+    return 'Unknown' if value is None else value
+
+
+def display_project(project: Optional[str]) -> str:
+    return 'Unknown' if project is None else project.replace('Global2_', '')
+
+
+class ResultStore:
+    """Append-only columnar store of STAC items, addressed by offset
+
+    One thread may append while another reads offsets it has already been
+    given; whole-column operations take the store lock.
+    """
+
+    def __init__(self, items: Iterable[Dict[str, Any]] = ()):
+        self.lock = threading.Lock()
+        self.strings: List[Optional[str]] = []  # Interned string table; None for missing values
+        self._string_codes: Dict[str, int] = {}
+        self.offsets: Dict[Tuple[str, str], int] = {}
+
+        self.ids: List[str] = []
+        self.collections = array('I')
+        self.projects = array('I')
+        self.resolutions = array('I')
+        self.titles = array('I')
+        self.size_texts = array('I')  # Size as shown, e.g. '4.41 MB'
+        self.size_properties = array('I')  # The item's own size property
+        self.datetimes = array('I')  # Raw datetime strings, for the details dialog
+        self.date_texts = array('I')  # YYYY-MM-DD as shown in the results
+        self.years = array('i')  # 0 if unknown; for sorting and facets
+        self.raw_years: Dict[int, Any] = {}  # Offset -> year property, where it is not an int
+        self.resolution_metres = array('d')
+        self.size_bytes = array('q')
+        self.timestamps = array('d')
+        self.agesex = array('b')
+        self.summary_assets: List[Optional[Dict[str, Any]]] = []  # Download asset(s) only
+
+        self.append(items)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _intern(self, value: Any) -> int:
+        text = None if value is None else str(value)
+        code = self._string_codes.get(text)
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(text)
+            self._string_codes[text] = code
+        return code
+
+    def append(self, items: Iterable[Dict[str, Any]]) -> range:
+        """Add items (skipping ones already stored) and return the new offsets"""
+        with self.lock:
+            return self._append(items)
+
+    def _append(self, items: Iterable[Dict[str, Any]]) -> range:
+        start = len(self.ids)
+        for item in items:
+            key = item_key(item)
+            if key in self.offsets:
+                continue
+            self.offsets[key] = len(self.ids)
+
+            properties = item.get('properties', {})
+            info = get_item_info(item)
+            updated = parse_datetime(info['last_updated'])
+            year = properties.get('year', _MISSING)
+            if not (isinstance(year, int) and not isinstance(year, bool)):
+                self.raw_years[len(self.ids)] = year
+
+            self.ids.append(item.get('id'))
+            self.collections.append(self._intern(item.get('collection')))
+            self.projects.append(self._intern(properties.get('project')))
+            self.resolutions.append(self._intern(properties.get('resolution')))
+            self.titles.append(self._intern(properties.get('title')))
+            self.size_texts.append(self._intern(info['size']))
+            self.size_properties.append(self._intern(properties.get('size')))
+            self.datetimes.append(self._intern(info['last_updated']))
+            self.date_texts.append(self._intern(updated.strftime('%Y-%m-%d') if updated else info['last_updated']))
+            self.years.append(int(year) if str(year).isdigit() else 0)
+            self.resolution_metres.append(resolution_metres(properties.get('resolution')))
+            self.size_bytes.append(parse_size_bytes(info['size']))
+            self.timestamps.append(updated.timestamp() if updated else UNKNOWN_TIME)
+            self.agesex.append(1 if is_agesex_item(item) else 0)
+            self.summary_assets.append(summarize_item(item)['assets'] or None)
+        return range(start, len(self.ids))
+
+    # Per-offset accessors
+
+    def key(self, offset: int) -> Tuple[str, str]:
+        return self.strings[self.collections[offset]], self.ids[offset]
+
+    def offset(self, key: Tuple[str, str]) -> Optional[int]:
+        return self.offsets.get(key)
+
+    def file_type(self, offset: int) -> str:
+        return "ZIP" if self.agesex[offset] else "TIF"
+
+    def values(self, offset: int) -> Tuple[Any, ...]:
+        """Results tree columns, in display order"""
+        strings = self.strings
+        year = self.years[offset]
+        return (
+            display_text(strings[self.collections[offset]]),
+            display_text(self.ids[offset]),
+            year if year else 'Unknown',
+            display_text(strings[self.resolutions[offset]]),
+            display_project(strings[self.projects[offset]]),
+            self.file_type(offset),
+            display_text(strings[self.size_texts[offset]]),
+            display_text(strings[self.date_texts[offset]]),
+            '📋 Details'  # Details button column
+        )
+
+    def info(self, offset: int) -> Dict[str, Any]:
+        """Same shape as items.get_item_info"""
+        return {
+            'size': self.strings[self.size_texts[offset]],
+            'download_type': 'Archive' if self.agesex[offset] else 'Data File',
+            'last_updated': self.strings[self.datetimes[offset]],
+        }
+
+    def summary(self, offset: int) -> Dict[str, Any]:
+        """Item-shaped summary (see items.summarize_item) rebuilt from the columns"""
+        strings = self.strings
+        year = self.raw_years.get(offset, self.years[offset])
+        properties = {'year': year} if year is not _MISSING else {}
+        for name, column in (('resolution', self.resolutions), ('project', self.projects),
+                             ('title', self.titles), ('datetime', self.datetimes),
+                             ('size', self.size_properties)):
+            value = strings[column[offset]]
+            if value is not None:
+                properties[name] = value
+        return {
+            'id': self.ids[offset],
+            'collection': strings[self.collections[offset]],
+            'properties': properties,
+            'assets': dict(self.summary_assets[offset] or {}),
+        }
+
+    def facet_value(self, facet: str, offset: int) -> str:
+        """Facet value as facets.normalize_selection spells it"""
+        if facet == 'collection':
+            return display_text(self.strings[self.collections[offset]])
+        if facet == 'year':
+            return str(self.years[offset])
+        if facet == 'resolution':
+            return display_text(self.strings[self.resolutions[offset]])
+        if facet == 'project':
+            return display_project(self.strings[self.projects[offset]])
+        if facet == 'file_type':
+            return self.file_type(offset)
+        raise ValueError(f"Unknown facet: {facet}")
+
+    # Whole-column operations
+
+    def sort_column(self, column: str) -> Sequence[Any]:
+        """Typed sort key of every offset for one of SORT_COLUMNS"""
+        if column == "Collection":
+            lowered = [display_text(text).lower() for text in self.strings]
+            return [lowered[code] for code in self.collections]
+        if column == "Item ID":
+            return [display_text(item_id).lower() for item_id in self.ids]
+        if column == "Year":
+            return self.years
+        if column == "Resolution":
+            return self.resolution_metres
+        if column == "Project":
+            lowered = [display_project(text).lower() for text in self.strings]
+            return [lowered[code] for code in self.projects]
+        if column == "File Type":
+            return self.agesex  # TIF (0) sorts before ZIP (1)
+        if column == "Size":
+            return self.size_bytes
+        if column == "Updated":
+            return self.timestamps
+        raise ValueError(f"Unknown sort column: {column}")
+
+    def order(self, offsets: Sequence[int], sort_spec: List[Tuple[str, bool]]) -> List[int]:
+        """offsets ordered by [(column, ascending), ...], primary column first
+
+        Python's sort is stable, so sorting by each column from the least to the
+        most significant yields a multi-column order; reverse=True keeps ties stable.
+        """
+        order = list(offsets)
+        with self.lock:
+            columns = [(self.sort_column(column), ascending) for column, ascending in reversed(sort_spec)
+                       if column in SORT_COLUMNS]
+        for keys, ascending in columns:
+            order.sort(key=keys.__getitem__, reverse=not ascending)
+        return order
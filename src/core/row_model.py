@@ -0,0 +1,60 @@
+"""
+Item Row Model - parsing helpers and display values for single items
+
+The results list itself lives in the columnar ResultStore, which uses the
+parsing helpers here; selected_values() serves the selected items tree.
+Shared by the GUI and the CLI, so no tkinter here.
+"""
+import re
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+from src.core.items import get_item_info, is_agesex_item
+
+SIZE_UNITS = {'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'TB': 1024 ** 4}
+SIZE_PATTERN = re.compile(r'([\d.]+)\s*([KMGT]?B)?', re.IGNORECASE)
+RESOLUTION_PATTERN = re.compile(r'([\d.]+)\s*(km|m)\b', re.IGNORECASE)
+
+# Sortable results columns
+SORT_COLUMNS = ("Collection", "Item ID", "Year", "Resolution", "Project", "File Type", "Size", "Updated")
+
+
+def parse_size_bytes(size: Any) -> int:
+    """Size in bytes from a file:size value or a string such as '4.41 MB' (0 if unknown)"""
+    if isinstance(size, (int, float)):
+        return int(size)
+    match = SIZE_PATTERN.search(str(size or ''))
+    if not match:
+        return 0
+    try:
+        value = float(match.group(1))
+    except ValueError:
+        return 0
+    unit = (match.group(2) or '').upper()
+    return int(value * SIZE_UNITS.get(unit, 1))
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp as returned by the STAC API"""
+    if not isinstance(value, str) or not value or value == 'Unknown':
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def resolution_metres(resolution: Any) -> float:
+    """Resolution in metres from values such as '100m' or '1km' (0 if unknown)"""
+    match = RESOLUTION_PATTERN.search(str(resolution or ''))
+    if not match:
+        return 0
+    value = float(match.group(1))
+    return value * 1000 if match.group(2).lower() == 'km' else value
+
+
+def selected_values(item: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Downloads tab columns of an item (without the status column)"""
+    file_type = "ZIP" if is_agesex_item(item) else "TIF"
+    return (item.get('properties', {}).get('title'), item.get('collection'),
+            item.get('id'), file_type, get_item_info(item)['size'])
@@ -0,0 +1,126 @@
+"""
+Search Operations - item search with filters from the CQL2 filter builder
+
+Shared by the GUI and the headless CLI, so nothing here may import tkinter or PIL.
+"""
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+
+from src.core.cancel import CancelToken
+from src.core.filter_builder import build_search_filter, matches_nothing
+from src.core.query_cache import query_key
+
+SEARCH_LIMIT = 10000
+SEARCH_PAGE_SIZE = 1000  # Items per page when results are streamed
+
+
+def search_collections(client, collections: List[str],
+                       years: List[int] = None,
+                       resolutions: List[str] = None,
+                       projects: List[str] = None,
+                       limit: int = SEARCH_LIMIT,
+                       raise_errors: bool = False,
+                       cache=None,
+                       bbox: Optional[List[float]] = None) -> List[Dict[str, Any]]:
+    """Run a single CQL2 JSON search over the given collections
+
+    cache, a QueryCache, answers repeated searches without an API request
+    (only used with raise_errors).
+    """
+    filter_json = build_search_filter(years, resolutions, projects)
+    if matches_nothing(filter_json):
+        return []
+    # Without raise_errors a failed search returns partial results, which are not cached
+    key = (query_key(collections, filter_json, limit, bbox, getattr(client, 'base_url', None))
+           if cache is not None and raise_errors else None)
+    if key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached[0]
+
+    results = client.search_items(
+        collections=collections,
+        bbox=bbox,
+        filter_expr=filter_json,
+        filter_lang="cql2-json" if filter_json else None,
+        limit=limit,
+        raise_errors=raise_errors
+    )
+    if key is not None and results:
+        cache.put(key, results)
+    return results
+
+
+def iter_search_pages(client, collections: List[str],
+                      years: List[int] = None,
+                      resolutions: List[str] = None,
+                      projects: List[str] = None,
+                      page_size: int = SEARCH_PAGE_SIZE,
+                      limit: int = SEARCH_LIMIT,
+                      raise_errors: bool = False,
+                      cache=None,
+                      cancel: Optional[CancelToken] = None,
+                      bbox: Optional[List[float]] = None) -> Iterator[Tuple[List[Dict[str, Any]], Optional[int]]]:
+    """Run the same search as search_collections, yielding (features, number_matched) per page
+
+    number_matched is the server's total match count, or None if it does not
+    report one. Stops once limit items have been yielded. With a QueryCache (and
+    raise_errors), a cached search is replayed in pages of page_size and a
+    fetched one is cached once every page has arrived. Cancelling the token
+    aborts the transfer and raises OperationCancelled.
+    """
+    filter_json = build_search_filter(years, resolutions, projects)
+    if matches_nothing(filter_json):
+        return
+    if cache is None or not raise_errors:
+        # Without raise_errors a failed request just ends the pages, so the
+        # result could be partial and is not cached
+        yield from _fetch_search_pages(client, collections, filter_json, page_size, limit, raise_errors,
+                                      cancel, bbox)
+        return
+
+    key = query_key(collections, filter_json, limit, bbox, getattr(client, 'base_url', None))
+    cached = cache.get(key)
+    if cached is not None:
+        features, number_matched = cached
+        for start in range(0, len(features), page_size):
+            if cancel is not None:
+                cancel.check()
+            yield features[start:start + page_size], number_matched
+        return
+
+    # Only a search whose pages were all consumed is cached, never a partial one
+    writer = cache.writer(key)
+    number_matched = None
+    for features, number_matched in _fetch_search_pages(client, collections, filter_json,
+                                                        page_size, limit, raise_errors, cancel, bbox):
+        writer.add(features)
+        yield features, number_matched
+    if writer.count:
+        writer.commit(number_matched)
+
+
+def _fetch_search_pages(client, collections: List[str], filter_json: Optional[Dict[str, Any]],
+                        page_size: int, limit: int,
+                        raise_errors: bool,
+                        cancel: Optional[CancelToken] = None,
+                        bbox: Optional[List[float]] = None) -> Iterator[Tuple[List[Dict[str, Any]], Optional[int]]]:
+    remaining = limit
+    pages = client.search_pages(
+        collections=collections,
+        filter_expr=filter_json,
+        filter_lang="cql2-json" if filter_json else None,
+        limit=min(page_size, limit),
+        bbox=list(bbox) if bbox else None,
+        raise_errors=raise_errors,
+        cancel=cancel
+    )
+    for page in pages:
+        features = page.get("features", [])[:remaining]
+        remaining -= len(features)
+        number_matched = page.get("numberMatched")
+        if number_matched is None:
+            number_matched = page.get("context", {}).get("matched")  # STAC context extension
+        yield features, number_matched
+        if remaining <= 0:
+            pages.close()
+            return
@@ -0,0 +1,83 @@
+"""
+Item Selection Set - ordered selection keyed by (collection, item id)
+
+Membership checks and toggles are O(1) dictionary operations instead of
+comparing full STAC item dicts. Listeners are told which items were added
+and removed, so views can apply diffs instead of redrawing everything.
+"""
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Tuple
+
+from src.core.items import item_key
+
+SelectionListener = Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], None]
+
+
+class SelectionSet:
+    """Insertion-ordered set of STAC items with change notifications"""
+
+    def __init__(self):
+        self._items: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._listeners: List[SelectionListener] = []
+
+    def add_listener(self, listener: SelectionListener):
+        """Call listener(added, removed) after every change"""
+        self._listeners.append(listener)
+
+    def _notify(self, added: List[Dict[str, Any]], removed: List[Dict[str, Any]]):
+        if added or removed:
+            for listener in self._listeners:
+                listener(added, removed)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._items.values()))
+
+    def __contains__(self, item: Dict[str, Any]) -> bool:
+        return item_key(item) in self._items
+
+    def contains_key(self, key: Tuple[str, str]) -> bool:
+        return key in self._items
+
+    def _add(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        added = []
+        for item in items:
+            key = item_key(item)
+            if key not in self._items:
+                self._items[key] = item
+                added.append(item)
+        return added
+
+    def _remove(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        removed = []
+        for item in items:
+            existing = self._items.pop(item_key(item), None)
+            if existing is not None:
+                removed.append(existing)
+        return removed
+
+    def toggle(self, item: Dict[str, Any]) -> bool:
+        """Select an unselected item or deselect a selected one; returns the new state"""
+        if item in self:
+            self._notify([], self._remove([item]))
+            return False
+        self._notify(self._add([item]), [])
+        return True
+
+    def add_many(self, items: Iterable[Dict[str, Any]]):
+        """Bulk select"""
+        self._notify(self._add(items), [])
+
+    def replace(self, items: Iterable[Dict[str, Any]]):
+        """Make the selection exactly items, reporting only the difference"""
+        items = list(items)
+        keep = {item_key(item) for item in items}
+        removed = self._remove([item for key, item in self._items.items() if key not in keep])
+        self._notify(self._add(items), removed)
+
+    def clear(self):
+        """Deselect everything"""
+        removed = list(self._items.values())
+        self._items.clear()
+        self._notify([], removed)
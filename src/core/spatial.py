@@ -0,0 +1,120 @@
+"""
+Spatial Index - STR-packed R-tree over collection extents
+
+Collections are bulk-loaded once per catalog load with Sort-Tile-Recursive
+packing, so a region query only visits the nodes whose boxes overlap it
+instead of every country. Boxes crossing the antimeridian (west > east) are
+split in two. Shared by the GUI and the CLI, so no tkinter here.
+"""
+import math
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+BBox = Tuple[float, float, float, float]  # west, south, east, north
+NODE_CAPACITY = 16
+
+
+def parse_bbox(values: Sequence[Any]) -> BBox:
+    """(west, south, east, north) from four numbers, validating latitudes"""
+    if len(values) != 4:
+        raise ValueError("A bounding box needs four values: west south east north")
+    west, south, east, north = (float(value) for value in values)
+    if not -90 <= south <= north <= 90:
+        raise ValueError("Bounding box latitudes must satisfy -90 <= south <= north <= 90")
+    if not (-180 <= west <= 180 and -180 <= east <= 180):
+        raise ValueError("Bounding box longitudes must be between -180 and 180")
+    return west, south, east, north
+
+
+def split_antimeridian(bbox: BBox) -> List[BBox]:
+    """One box, or two if it crosses the antimeridian (west > east, as STAC allows)"""
+    west, south, east, north = bbox
+    if west <= east:
+        return [bbox]
+    return [(west, south, 180.0, north), (-180.0, south, east, north)]
+
+
+def collection_bbox(collection: Dict[str, Any]) -> Optional[BBox]:
+    """Overall extent of a collection (the first extent.spatial.bbox), if it has one"""
+    boxes = collection.get('extent', {}).get('spatial', {}).get('bbox') or []
+    if not boxes or len(boxes[0]) < 4:
+        return None
+    box = boxes[0]
+    if len(box) == 6:  # 3D box: west, south, min z, east, north, max z
+        box = [box[0], box[1], box[3], box[4]]
+    try:
+        return tuple(float(value) for value in box[:4])
+    except (TypeError, ValueError):
+        return None
+
+
+def _intersects(a: BBox, b: BBox) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _union(boxes: Sequence[BBox]) -> BBox:
+    return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes))
+
+
+class BBoxIndex:
+    """Static R-tree of (key, bbox) entries, packed with Sort-Tile-Recursive"""
+
+    def __init__(self, entries: Sequence[Tuple[str, BBox]], capacity: int = NODE_CAPACITY):
+        self.capacity = capacity
+        leaves = [(box, key) for key, bbox in entries for box in split_antimeridian(bbox)]
+        self.size = len({key for key, _ in entries})
+        # Each level is a list of (bbox, children); leaf children are the keys
+        self.levels: List[List[Tuple[BBox, list]]] = []
+        level = self._pack(leaves)
+        while level:
+            self.levels.append(level)
+            if len(level) == 1:
+                break
+            level = self._pack(level)
+
+    def _pack(self, entries: List[Tuple[BBox, Any]]) -> List[Tuple[BBox, list]]:
+        """Group entries into nodes: sort by x centre into vertical slices, then each slice by y"""
+        if not entries:
+            return []
+        node_count = math.ceil(len(entries) / self.capacity)
+        slice_count = math.ceil(math.sqrt(node_count))
+        slice_size = slice_count * self.capacity
+
+        by_x = sorted(entries, key=lambda entry: entry[0][0] + entry[0][2])
+        nodes = []
+        for start in range(0, len(by_x), slice_size):
+            vertical_slice = sorted(by_x[start:start + slice_size], key=lambda entry: entry[0][1] + entry[0][3])
+            for node_start in range(0, len(vertical_slice), self.capacity):
+                children = vertical_slice[node_start:node_start + self.capacity]
+                nodes.append((_union([box for box, _ in children]), children))
+        return nodes
+
+    def __len__(self) -> int:
+        return self.size
+
+    @classmethod
+    def from_collections(cls, collections: Sequence[Dict[str, Any]]) -> 'BBoxIndex':
+        """Index of collection id -> extent; collections without an extent are left out"""
+        entries = []
+        for collection in collections:
+            bbox = collection_bbox(collection)
+            if bbox is not None and collection.get('id'):
+                entries.append((collection['id'], bbox))
+        return cls(entries)
+
+    def query(self, bbox: BBox) -> List[str]:
+        """Keys whose boxes intersect bbox, sorted"""
+        if not self.levels:
+            return []
+        found = set()
+        for query_box in split_antimeridian(bbox):
+            stack = [(len(self.levels) - 1, node) for node in self.levels[-1]]
+            while stack:
+                depth, (box, children) = stack.pop()
+                if not _intersects(box, query_box):
+                    continue
+                if depth == 0:
+                    found.update(key for child_box, key in children if _intersects(child_box, query_box))
+                else:
+                    stack.extend((depth - 1, child) for child in children)
+        return sorted(found)
@@ -3,6 +3,11 @@ Download Tab UI Components
 """
 import tkinter as tk
 from tkinter import ttk
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.cog import cog_available
 
 
 def setup_enhanced_download_tab(app):
@@ -29,6 +34,18 @@ def setup_enhanced_download_tab(app):
     ttk.Button(dir_frame, text="Browse", style='Clean.TButton',
               command=app.select_download_dir).pack(side=tk.RIGHT)
     
+    # Shared cache selection (empty disables the cache)
+    cache_frame = ttk.Frame(settings_frame, style="Clean.TFrame")
+    cache_frame.pack(fill=tk.X, pady=2)
+
+    ttk.Label(cache_frame, text="Shared cache:", style="Clean.TLabel").pack(side=tk.LEFT)
+    cache_entry = ttk.Entry(cache_frame, textvariable=app.cache_dir, state="readonly", style="Clean.TEntry")
+    cache_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+    ttk.Button(cache_frame, text="Clear", style='Clean.TButton',
+              command=lambda: app.cache_dir.set("")).pack(side=tk.RIGHT)
+    ttk.Button(cache_frame, text="Browse", style='Clean.TButton',
+              command=app.select_cache_dir).pack(side=tk.RIGHT, padx=(0, 5))
+
     # Download options
     options_frame = ttk.Frame(settings_frame, style="Clean.TFrame")
     options_frame.pack(fill=tk.X, pady=5)
@@ -36,6 +53,14 @@ def setup_enhanced_download_tab(app):
     app.create_subfolders = tk.BooleanVar(value=True)
     ttk.Checkbutton(options_frame, text="Create subfolders by country/year", 
                    variable=app.create_subfolders, style='Clean.TCheckbutton').pack(side=tk.LEFT)
+
+    app.convert_cog = tk.BooleanVar(value=False)
+    cog_text = "Convert GeoTIFFs to Cloud-Optimized GeoTIFF"
+    if not cog_available():
+        cog_text += " (requires rasterio)"
+    ttk.Checkbutton(options_frame, text=cog_text, variable=app.convert_cog,
+                   style='Clean.TCheckbutton',
+                   state='normal' if cog_available() else 'disabled').pack(side=tk.LEFT, padx=(15, 0))
     
     # Selected items preview
     preview_frame = ttk.LabelFrame(download_frame, text="📋 Selected Items", 
@@ -142,6 +167,8 @@ def setup_enhanced_download_tab(app):
     def stop_download(app):
         """Stop current download"""
         app.download_active.set(False)
+        if getattr(app, 'download_stop_event', None) is not None:
+            app.download_stop_event.set()
         app.download_button.config(state='normal')
         app.stop_button.config(state='disabled')
         app.progress_var.set(0)
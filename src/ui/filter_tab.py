@@ -144,13 +144,8 @@ def setup_enhanced_filter_tab(app):
     # Quick actions
     ttk.Button(search_frame, text="Select All", style='Clean.TButton',
               command=app.select_all_collections).pack(side=tk.LEFT, padx=(0, 5))
-    def clear_all_selections():
-        for item in app.collections_tree.get_children():
-            app.collections_tree.item(item, text='☐')
-        app.update_stats()
-    
     ttk.Button(search_frame, text="Clear All", style='Clean.TButton',
-              command=clear_all_selections).pack(side=tk.LEFT, padx=(0, 5))
+              command=app.clear_collection_selection).pack(side=tk.LEFT, padx=(0, 5))
     
     # Statistics on the right
     ttk.Label(search_frame, text="Collections:", font=('Segoe UI', 10)).pack(side=tk.LEFT, padx=(15, 5))
@@ -166,6 +161,24 @@ def setup_enhanced_filter_tab(app):
     app.stats_results = ttk.Label(search_frame, text="0", font=('Segoe UI', 9, 'bold'))
     app.stats_results.pack(side=tk.LEFT, padx=(0, 15))
     
+    # Region: select the countries a bounding box touches, optionally limit the search to it
+    region_frame = ttk.Frame(countries_section, padding=(10, 0, 10, 8))
+    region_frame.pack(fill=tk.X)
+
+    ttk.Label(region_frame, text="Region:", font=('Segoe UI', 10, 'bold')).pack(side=tk.LEFT, padx=(0, 5))
+    app.region_vars = []
+    for label in ("West", "South", "East", "North"):
+        var = tk.StringVar()
+        ttk.Label(region_frame, text=label, font=('Segoe UI', 9)).pack(side=tk.LEFT, padx=(5, 2))
+        ttk.Entry(region_frame, textvariable=var, width=8).pack(side=tk.LEFT)
+        app.region_vars.append(var)
+
+    ttk.Button(region_frame, text="Select in Region", style='Clean.TButton',
+              command=app.select_collections_in_region).pack(side=tk.LEFT, padx=(15, 5))
+    app.region_search_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(region_frame, text="Limit search to region", variable=app.region_search_var,
+                    style='Clean.TCheckbutton').pack(side=tk.LEFT, padx=(5, 0))
+
     # Collections list
     list_frame = ttk.Frame(countries_section)
     list_frame.pack(fill=tk.BOTH, expand=True)
@@ -200,6 +213,8 @@ def setup_enhanced_filter_tab(app):
     # Configure row styling for button appearance
     app.collections_tree.tag_configure('button_cell', background='#f8f9fa', foreground='#495057')
     app.collections_tree.tag_configure('button_hover', background='#e9ecef', foreground='#0d6efd')
+    # Collections whose data changed since they were last downloaded
+    app.collections_tree.tag_configure('changed', foreground='#b35c00')
     
     # Bind events - separate handling for selection vs preview
     def handle_tree_click(event):
@@ -327,11 +342,16 @@ def setup_enhanced_filter_tab(app):
     for col in range(8):
         years_frame.columnconfigure(col, weight=1, uniform="year_col")
     
+    # Checkbuttons by facet and value, so result counts can be shown next to them
+    app.facet_checks = {'year': {}, 'resolution': {}, 'project': {}}
+    
     app.year_vars = {}
     for i, year in enumerate(AVAILABLE_YEARS):
         var = tk.BooleanVar()
         app.year_vars[year] = var
-        cb = ttk.Checkbutton(years_frame, text=str(year), variable=var, style='Clean.TCheckbutton')
+        cb = ttk.Checkbutton(years_frame, text=str(year), variable=var, style='Clean.TCheckbutton',
+                             command=app.update_facet_counts)
+        app.facet_checks['year'][str(year)] = (cb, str(year))
         cb.grid(row=i//8, column=i%8, sticky=tk.W+tk.E, padx=3, pady=4)
     
     # Resolution filter (center)
@@ -343,7 +363,9 @@ def setup_enhanced_filter_tab(app):
     for res in AVAILABLE_RESOLUTIONS:
         var = tk.BooleanVar(value=True)
         app.resolution_vars[res] = var
-        cb = ttk.Checkbutton(resolution_frame, text=res, variable=var, style='Clean.TCheckbutton')
+        cb = ttk.Checkbutton(resolution_frame, text=res, variable=var, style='Clean.TCheckbutton',
+                             command=app.update_facet_counts)
+        app.facet_checks['resolution'][res] = (cb, res)
         cb.pack(anchor=tk.W, pady=3, padx=3)
     
     # Project filter (right)
@@ -356,7 +378,9 @@ def setup_enhanced_filter_tab(app):
         var = tk.BooleanVar(value=True)
         app.project_vars[proj] = var
         display_name = proj.replace("Global2_", "").replace("_", " & ")
-        cb = ttk.Checkbutton(project_frame, text=display_name, variable=var, style='Clean.TCheckbutton')
+        cb = ttk.Checkbutton(project_frame, text=display_name, variable=var, style='Clean.TCheckbutton',
+                             command=app.update_facet_counts)
+        app.facet_checks['project'][proj.replace("Global2_", "")] = (cb, display_name)
         cb.pack(anchor=tk.W, pady=3, padx=3)
     
     # Search controls - bottom section
@@ -371,7 +395,12 @@ def setup_enhanced_filter_tab(app):
                                   style='CleanPrimary.TButton',
                                   command=app.search_items)
     app.search_button.pack(side=tk.LEFT, padx=(0, 15))
-    
+
+    # Offline search against the local catalog mirror, if one has been synced
+    if app.mirror is not None:
+        ttk.Checkbutton(search_controls, text="Offline", variable=app.offline_var,
+                        style='Clean.TCheckbutton').pack(side=tk.LEFT, padx=(0, 15))
+
     # Progress bar and status
     progress_container = ttk.Frame(search_controls, style='Clean.TFrame')
     progress_container.pack(side=tk.LEFT, fill=tk.X, expand=True)
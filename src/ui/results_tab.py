@@ -7,7 +7,10 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.utils.item_details import show_item_details
+from src.core.row_model import SORT_COLUMNS
+from src.utils.virtual_tree import VirtualTreeview
+
+SHIFT_MASK = 0x0001  # Shift bit of a Tk event's state
 
 
 def setup_enhanced_results_tab(app):
@@ -32,6 +35,9 @@ def setup_enhanced_results_tab(app):
               command=app.clear_selection).pack(side=tk.LEFT, padx=(0, 5))
     ttk.Button(controls_frame, text="Show Details", style='Clean.TButton',
               command=app.show_selected_item_details).pack(side=tk.LEFT, padx=(0, 5))
+    app.export_button = ttk.Button(controls_frame, text="Export", style='Clean.TButton',
+                                   command=app.export_results)
+    app.export_button.pack(side=tk.LEFT, padx=(0, 5))
     ttk.Button(controls_frame, text="Go to Downloads", style='CleanPrimary.TButton',
               command=app.go_to_downloads).pack(side=tk.LEFT, padx=(0, 5))
     
@@ -49,20 +55,20 @@ def setup_enhanced_results_tab(app):
     column_widths = {"Collection": 40, "Item ID": 220, "Year": 50, "Resolution": 50,
                     "Project": 100, "File Type": 40, "Size": 50, "Updated": 70, "Details": 70}
     
-    # Initialize sorting state for each column
-    app.sort_columns = {}
+    # Sorting state: [(column, ascending), ...] with the primary column first
+    app.sort_spec = []
     
     for col in columns:
         width = column_widths.get(col, 100)
         app.results_tree.column(col, width=width)
         app.results_tree.heading(col, text=col)
-        # Initialize sort state (True = ascending, False = descending, None = no sort)
-        app.sort_columns[col] = None
     
-    # Scrollbars
-    tree_v_scroll = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=app.results_tree.yview)
+    # Scrollbars - the vertical one is driven by the virtual view, which keeps
+    # only the visible rows in the widget
+    tree_v_scroll = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
     tree_h_scroll = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=app.results_tree.xview)
-    app.results_tree.configure(yscrollcommand=tree_v_scroll.set, xscrollcommand=tree_h_scroll.set)
+    app.results_tree.configure(xscrollcommand=tree_h_scroll.set)
+    app.results_view = VirtualTreeview(app.results_tree, tree_v_scroll, app.render_result_row)
     
     app.results_tree.grid(row=0, column=0, sticky='nsew')
     tree_v_scroll.grid(row=0, column=1, sticky='ns')
@@ -97,6 +103,8 @@ def setup_enhanced_results_tab(app):
         
         # print(f"Results click: region={region}, column={column}, item={item}")  # Debug
         
+        if region == "heading" and event.state & SHIFT_MASK:
+            return on_heading_shift_click(event)
         if region == "cell" and item:
             if column == "#9":  # Details column (9th column)
                 # print("Item details button clicked!")  # Debug
@@ -119,127 +127,55 @@ def setup_enhanced_results_tab(app):
     def show_item_details_for_result(app, tree_item):
         """Show details for selected result item"""
         try:
-            item_index = app.results_tree.index(tree_item)
-            if item_index < len(app.search_results):
-                selected_item = app.search_results[item_index]
-                
-                # Get item info
-                item_id = selected_item.get('id', '').lower()
-                if 'agesex' in item_id:
-                    info = app.get_agesex_info(selected_item)
-                else:
-                    info = app.get_population_info(selected_item)
-                
-                # Show details dialog
-                show_item_details(app.root, selected_item, info)
+            offset = app.results_view.data_index(tree_item)
+            if offset is not None:
+                app.show_result_details(offset)
         except Exception as e:
             print(f"Error showing item details: {e}")
     
-    def sort_results_by_column(app, column):
-        """Sort results by the specified column"""
-        if not app.search_results:
+    def sort_results_by_column(app, column, add=False):
+        """Sort results by the specified column; shift-click (add=True) adds a secondary column"""
+        if not app.result_offsets:
             return
         
-        # Toggle sort direction for this column
-        current_sort = app.sort_columns.get(column)
-        if current_sort is None or current_sort == False:
-            ascending = True
-        else:
-            ascending = False
-        
-        app.sort_columns[column] = ascending
-        
-        # Reset other columns' sort state
-        for col in app.sort_columns:
-            if col != column:
-                app.sort_columns[col] = None
-        
-        # Define sorting key functions for different data types
-        def get_sort_key(item, col_name):
-            if col_name == "Collection":
-                return item.get('collection', '').lower()
-            elif col_name == "Item ID":
-                return item.get('id', '').lower()
-            elif col_name == "Year":
-                year = item.get('properties', {}).get('year', 0)
-                return int(year) if str(year).isdigit() else 0
-            elif col_name == "Resolution":
-                res = item.get('properties', {}).get('resolution', '')
-                # Convert resolution to numeric for proper sorting (100m -> 100, 1km -> 1000)
-                if '100m' in str(res):
-                    return 100
-                elif '1km' in str(res):
-                    return 1000
-                else:
-                    return 0
-            elif col_name == "Project":
-                proj = item.get('properties', {}).get('project', '').replace('Global2_', '')
-                return proj.lower()
-            elif col_name == "File Type":
-                item_id = item.get('id', '').lower()
-                return "ZIP" if 'agesex' in item_id else "TIF"
-            elif col_name == "Size":
-                # Extract numeric value from size string for sorting
-                item_id = item.get('id', '').lower()
-                if 'agesex' in item_id:
-                    info = app.get_agesex_info(item)
-                else:
-                    info = app.get_population_info(item)
-                size_str = str(info['size'])
-                # Extract numeric part (e.g., "4.41 MB" -> 4.41)
-                try:
-                    import re
-                    match = re.search(r'([\d.]+)', size_str)
-                    if match:
-                        value = float(match.group(1))
-                        # Convert to bytes for consistent sorting
-                        if 'GB' in size_str.upper():
-                            return value * 1024 * 1024 * 1024
-                        elif 'MB' in size_str.upper():
-                            return value * 1024 * 1024
-                        elif 'KB' in size_str.upper():
-                            return value * 1024
-                        else:
-                            return value
-                    return 0
-                except:
-                    return 0
-            elif col_name == "Updated":
-                item_id = item.get('id', '').lower()
-                if 'agesex' in item_id:
-                    info = app.get_agesex_info(item)
-                else:
-                    info = app.get_population_info(item)
-                date_str = info['last_updated']
-                if date_str and date_str != 'Unknown':
-                    try:
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                        return dt
-                    except:
-                        return datetime.min
-                return datetime.min
+        position = next((i for i, (col, _) in enumerate(app.sort_spec) if col == column), None)
+        if add:
+            # Append the column as a tie-breaker, or flip its direction if already sorted on
+            if position is None:
+                app.sort_spec.append((column, True))
             else:
-                return ''
-        
-        # Sort the search results
-        app.search_results.sort(key=lambda x: get_sort_key(x, column), reverse=not ascending)
+                app.sort_spec[position] = (column, not app.sort_spec[position][1])
+        else:
+            # Toggle sort direction for this column and drop any other sort columns
+            ascending = not (position == 0 and app.sort_spec[0][1])
+            app.sort_spec = [(column, ascending)]
         
-        # Update the display
-        app.update_search_results()
+        # Permute the virtual rows; the tree itself is not rebuilt
+        app.results_view.set_rows(app.sorted_result_order())
         
-        # Update column headers to show sort direction
+        # Update column headers to show sort direction (and rank for multi-column sorts)
+        directions = {col: (rank, ascending) for rank, (col, ascending) in enumerate(app.sort_spec, 1)}
         for col in columns:
             if col == "Details":  # Skip Details column
                 continue
-            if col == column:
-                if ascending:
-                    app.results_tree.heading(col, text=f"{col} ↑")
-                else:
-                    app.results_tree.heading(col, text=f"{col} ↓")
+            if col in directions:
+                rank, ascending = directions[col]
+                arrow = "↑" if ascending else "↓"
+                suffix = str(rank) if len(app.sort_spec) > 1 else ""
+                app.results_tree.heading(col, text=f"{col} {arrow}{suffix}")
             else:
                 app.results_tree.heading(col, text=col)
     
+    def on_heading_shift_click(event):
+        """Shift-click on a column header adds it as a secondary sort column"""
+        column = app.results_tree.identify_column(event.x)
+        if column == "#0":
+            return
+        col = columns[int(column[1:]) - 1]
+        if col in SORT_COLUMNS:
+            sort_results_by_column(app, col, add=True)
+        return "break"
+    
     # Add sorting functionality to column headers
     def setup_column_sorting():
         """Setup click handlers for column sorting"""
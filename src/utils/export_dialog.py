@@ -0,0 +1,71 @@
+"""
+Export Dialog - choose columns and rows for exporting search results
+"""
+import tkinter as tk
+from tkinter import ttk, filedialog
+
+
+class ExportDialog:
+    def __init__(self, parent, columns, default_columns, selected_count, parquet_available, on_export):
+        self.on_export = on_export
+        self.parquet_available = parquet_available
+
+        # Create dialog window
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Export Results")
+        self.dialog.resizable(False, False)
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+
+        self.column_vars = {column: tk.BooleanVar(value=column in default_columns) for column in columns}
+        self.selected_only_var = tk.BooleanVar(value=selected_count > 0)
+        self.geometry_var = tk.BooleanVar(value=False)
+
+        self.setup_ui(selected_count)
+
+    def setup_ui(self, selected_count):
+        """Setup the dialog UI"""
+        frame = ttk.Frame(self.dialog, padding=15)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        columns_frame = ttk.LabelFrame(frame, text="Columns", padding=10)
+        columns_frame.pack(fill=tk.X)
+        for index, (column, var) in enumerate(self.column_vars.items()):
+            ttk.Checkbutton(columns_frame, text=column, variable=var).grid(
+                row=index // 2, column=index % 2, sticky='w', padx=(0, 15), pady=2)
+
+        options_frame = ttk.LabelFrame(frame, text="Options", padding=10)
+        options_frame.pack(fill=tk.X, pady=(10, 0))
+        selected_check = ttk.Checkbutton(options_frame, text=f"Selected items only ({selected_count})",
+                                         variable=self.selected_only_var)
+        selected_check.pack(anchor='w')
+        if not selected_count:
+            selected_check.config(state='disabled')
+        ttk.Checkbutton(options_frame, text="Include geometry in GeoJSON (fetches full items)",
+                        variable=self.geometry_var).pack(anchor='w')
+
+        buttons = ttk.Frame(frame)
+        buttons.pack(fill=tk.X, pady=(15, 0))
+        ttk.Button(buttons, text="Cancel", command=self.dialog.destroy).pack(side=tk.RIGHT)
+        ttk.Button(buttons, text="Export...", style='CleanPrimary.TButton',
+                   command=self.choose_file).pack(side=tk.RIGHT, padx=(0, 5))
+
+    def choose_file(self):
+        """Ask for the output file; its extension picks the format"""
+        filetypes = [("CSV", "*.csv"), ("GeoJSON lines", "*.geojsonl")]
+        if self.parquet_available:
+            filetypes.append(("Parquet", "*.parquet"))
+        path = filedialog.asksaveasfilename(parent=self.dialog, title="Export Results",
+                                            defaultextension=".csv", filetypes=filetypes)
+        if not path:
+            return
+
+        columns = [column for column, var in self.column_vars.items() if var.get()]
+        self.dialog.destroy()
+        self.on_export(path, columns, self.selected_only_var.get(), self.geometry_var.get())
+
+
+def show_export_dialog(parent, columns, default_columns, selected_count, parquet_available, on_export):
+    """Show export options dialog; on_export(path, columns, selected_only, include_geometry)"""
+    dialog = ExportDialog(parent, columns, default_columns, selected_count, parquet_available, on_export)
+    return dialog
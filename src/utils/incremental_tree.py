@@ -0,0 +1,74 @@
+"""
+Incremental Tree Rendering - fill a Treeview in time-sliced batches
+
+Inserting thousands of rows in one loop blocks the Tk event loop; the
+renderer below inserts rows for a few milliseconds at a time and yields back
+to Tk in between, so scrolling and clicks keep working while a tree loads.
+"""
+import time
+from typing import Callable, Iterable, Optional, Any
+
+DEFAULT_SLICE_MS = 15  # Time budget per batch before yielding to the event loop
+
+
+class IncrementalRenderer:
+    """Run insert_row over a sequence of rows in idle-time batches
+
+    Starting a new render cancels the one in progress, so a new search or
+    filter always supersedes the previous one.
+    """
+
+    def __init__(self, widget, slice_ms: int = DEFAULT_SLICE_MS,
+                 on_progress: Optional[Callable[[int, int], None]] = None):
+        self.widget = widget  # Any Tk widget, used for after()/after_idle()
+        self.slice_ms = slice_ms
+        self.on_progress = on_progress
+        self.generation = 0
+        self.after_id = None
+
+    @property
+    def active(self) -> bool:
+        return self.after_id is not None
+
+    def start(self, rows: Iterable[Any], insert_row: Callable[[Any], None],
+              on_done: Optional[Callable[[], None]] = None):
+        """Cancel any render in progress and start inserting rows"""
+        self.cancel()
+        rows = list(rows)
+        generation = self.generation
+        state = {'position': 0}
+
+        def run_batch():
+            if generation != self.generation:
+                return  # Superseded by a newer render
+            deadline = time.perf_counter() + self.slice_ms / 1000
+            position = state['position']
+            while position < len(rows):
+                insert_row(rows[position])
+                position += 1
+                if time.perf_counter() >= deadline:
+                    break
+            state['position'] = position
+
+            if self.on_progress:
+                self.on_progress(position, len(rows))
+
+            if position < len(rows):
+                # after(1) rather than after_idle so pending input events run first
+                self.after_id = self.widget.after(1, run_batch)
+            else:
+                self.after_id = None
+                if on_done:
+                    on_done()
+
+        self.after_id = self.widget.after_idle(run_batch)
+
+    def cancel(self):
+        """Stop the render in progress, leaving already inserted rows in place"""
+        self.generation += 1
+        if self.after_id is not None:
+            try:
+                self.widget.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
@@ -0,0 +1,133 @@
+"""
+Virtual Treeview - only the rows visible on screen exist as Tk items
+
+The wrapped ttk.Treeview holds a fixed pool of row items that is re-filled
+from an in-memory sequence as the user scrolls, so rendering cost and Tk
+memory depend on the window height rather than on the number of results.
+"""
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Sequence, Tuple, Any, Optional
+
+DEFAULT_ROW_HEIGHT = 20
+
+
+class VirtualTreeview:
+    """Drive a ttk.Treeview and vertical scrollbar as a virtual list
+
+    rows is a sequence of data indices in display order (e.g. a sorted or
+    filtered permutation of the result list); render_row(index) returns the
+    (text, values, tags) to show for one data index.
+    """
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar,
+                 render_row: Callable[[int], Tuple[str, Sequence[Any], Tuple[str, ...]]]):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.render_row = render_row
+        self.rows: Sequence[int] = []
+        self.offset = 0
+        self.page_size = max(1, int(tree.cget('height')))
+        self.pool = []  # Recycled Tk row ids, one per visible line
+
+        self.scrollbar.configure(command=self.yview)
+        self.tree.bind('<Configure>', self.on_configure, add='+')
+        self.tree.bind('<MouseWheel>', self.on_mousewheel, add='+')
+        self.tree.bind('<Button-4>', lambda event: self.scroll(-3), add='+')
+        self.tree.bind('<Button-5>', lambda event: self.scroll(3), add='+')
+        self.tree.bind('<Prior>', lambda event: self.scroll(-self.page_size), add='+')
+        self.tree.bind('<Next>', lambda event: self.scroll(self.page_size), add='+')
+
+    def set_rows(self, rows: Sequence[int], keep_offset: bool = False):
+        """Show a new sequence of data indices"""
+        self.rows = rows
+        if not keep_offset:
+            self.offset = 0
+        self.refresh()
+
+    def data_index(self, row_id: str) -> Optional[int]:
+        """Data index displayed by a Tk row, or None for an unused row"""
+        try:
+            position = self.offset + self.tree.index(row_id)
+        except tk.TclError:
+            return None
+        if position < len(self.rows):
+            return self.rows[position]
+        return None
+
+    def row_for_index(self, index: int) -> Optional[str]:
+        """Tk row currently displaying a data index, if it is on screen"""
+        for position, row_id in enumerate(self.pool):
+            offset = self.offset + position
+            if offset < len(self.rows) and self.rows[offset] == index:
+                return row_id
+        return None
+
+    def refresh(self):
+        """Re-render the visible window from the data"""
+        total = len(self.rows)
+        self.offset = max(0, min(self.offset, total - self.page_size))
+
+        # Grow the pool to the current page size; extra rows are detached below
+        while len(self.pool) < self.page_size:
+            self.pool.append(self.tree.insert('', 'end', text=''))
+
+        for position, row_id in enumerate(self.pool):
+            offset = self.offset + position
+            if position < self.page_size and offset < total:
+                text, values, tags = self.render_row(self.rows[offset])
+                self.tree.item(row_id, text=text, values=values, tags=tags)
+                self.tree.move(row_id, '', position)  # Re-attaches rows detached earlier
+            else:
+                self.tree.detach(row_id)
+
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        total = len(self.rows)
+        if total <= self.page_size:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.page_size) / total)
+
+    def scroll(self, lines: int):
+        """Scroll by a number of lines and re-render"""
+        new_offset = max(0, min(self.offset + lines, len(self.rows) - self.page_size))
+        if new_offset != self.offset:
+            self.offset = new_offset
+            # Tk selection belongs to a recycled row, not to the data behind it
+            self.tree.selection_remove(self.tree.selection())
+            self.refresh()
+        return "break"
+
+    def yview(self, *args):
+        """Scrollbar command: 'moveto fraction' or 'scroll n units|pages'"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            target = int(float(args[1]) * len(self.rows))
+            self.scroll(target - self.offset)
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if len(args) > 2 and args[2] == 'pages':
+                amount *= self.page_size
+            self.scroll(amount)
+
+    def on_mousewheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        if event.delta == 0:
+            return "break"
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+    def on_configure(self, event):
+        """Recompute how many rows fit when the widget is resized"""
+        row_height = DEFAULT_ROW_HEIGHT
+        header_height = DEFAULT_ROW_HEIGHT + 4
+        if self.pool and self.tree.exists(self.pool[0]):
+            bbox = self.tree.bbox(self.pool[0])
+            if bbox:
+                header_height, row_height = bbox[1], bbox[3]
+        page_size = max(1, (event.height - header_height) // max(1, row_height))
+        if page_size != self.page_size:
+            self.page_size = page_size
+            self.refresh()